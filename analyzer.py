@@ -4,7 +4,6 @@ Takes parsed financial data and generates plain-English insights
 """
 
 import os
-import requests
 from qbo_parser import parse_qbo_gl, build_financial_statements, format_currency
 
 
@@ -58,6 +57,9 @@ def generate_ai_analysis(metrics: dict, api_key: str = None) -> str:
     if not api_key:
         return "⚠️ No API key provided. Set ANTHROPIC_API_KEY environment variable."
     
+    # Only needed when we actually call the API
+    import requests
+    
     # Build the prompt
     prompt = f"""You are a friendly financial advisor explaining a small business's Profit & Loss statement. 
 Analyze these numbers and provide insights in plain English that a non-accountant can understand.
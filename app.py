@@ -1862,7 +1862,7 @@ def render_analysis(analysis, is_demo=False, pnl_data=None, transactions=None, a
                     </div>
                     """, unsafe_allow_html=True)
                     if cat.monthly_trend:
-                        df = pd.DataFrame([{"Month": k, "Amount": v} for k, v in sorted(cat.monthly_trend.items())])
+                        df = pd.DataFrame([{"Month": k, "Amount": v} for k, v in cat.sorted_months()])
                         st.line_chart(df.set_index("Month"), color="#dc2626")
                     if cat.top_vendors and cat.top_vendors[0][0] != "Unknown":
                         st.caption(f"🏢 Top Vendor: {cat.top_vendors[0][0]}")
@@ -1888,7 +1888,7 @@ def render_analysis(analysis, is_demo=False, pnl_data=None, transactions=None, a
                                     if vendor != "Unknown":
                                         st.write(f"- {vendor}: {format_currency(amount)}")
                         if cat.monthly_trend:
-                            df = pd.DataFrame([{"Month": k, "Amount": v} for k, v in sorted(cat.monthly_trend.items())])
+                            df = pd.DataFrame([{"Month": k, "Amount": v} for k, v in cat.sorted_months()])
                             st.line_chart(df.set_index("Month"), color="#f59e0b")
             else:
                 st.success("✓ No highly volatile expenses found.")
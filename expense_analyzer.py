@@ -3,17 +3,17 @@ G&A Expense Analyzer - Deep Dive Module
 Audits expenses, identifies cost drivers, provides contextual insights
 """
 
-import os
-import json
-import requests
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass, field
 from collections import defaultdict
+from operator import attrgetter, itemgetter
 from gl_analyzer import (
     load_account_mapping, parse_gl_with_mapping, build_financial_statements,
-    AccountType, Transaction, AccountSummary, format_currency
+    AccountType, Transaction, AccountSummary, TransactionTable, format_currency, read_gl_sheet,
+    clean_text_column
 )
 
 
@@ -51,6 +51,15 @@ class ExpenseCategory:
     consistency_expected: bool = False  # True for rent, insurance, etc.
     has_anomaly: bool = False  # Flagged if expected consistent but isn't
 
+    def sorted_months(self) -> List[Tuple[str, float]]:
+        """monthly_trend as (month, amount) pairs in month-key order"""
+        return sorted(self.monthly_trend.items())
+
+    def month_extremes(self) -> Tuple[Tuple[str, float], Tuple[str, float]]:
+        """(lowest, highest) (month, amount) pairs; first month wins ties"""
+        months = self.sorted_months()
+        return min(months, key=itemgetter(1)), max(months, key=itemgetter(1))
+
 
 @dataclass
 class GAAnalysis:
@@ -303,65 +312,78 @@ def calculate_variance_stats(monthly_amounts: Dict[str, float]) -> Tuple[float,
     return (mean, std_dev, cv, is_consistent)
 
 
-def analyze_vendors(transactions: List[Transaction]) -> List[VendorAnalysis]:
-    """Analyze spending by vendor"""
-    vendor_data = defaultdict(lambda: {
-        "total": 0,
-        "count": 0,
-        "accounts": set(),
-        "months": set()
+def _vendor_labels(vendors: np.ndarray) -> np.ndarray:
+    """Stripped vendor names; blanks, "nan" and "None" become "Unknown"."""
+    names = pd.Series(vendors, dtype=object).str.strip()
+    return names.where(names.notna() & ~names.isin(["", "nan", "None"]), "Unknown").to_numpy(dtype=object)
+
+
+def _month_ids(dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Integer month codes (-1 where a date can't be bucketed) and their labels"""
+    codes, labels = pd.factorize(pd.Series([_month_key(d) for d in dates], dtype=object))
+    return codes, np.asarray(labels, dtype=object)
+
+
+def analyze_vendors(transactions: Union[List[Transaction], TransactionTable]) -> List[VendorAnalysis]:
+    """Analyze spending by vendor (accepts a Transaction list or TransactionTable)"""
+    table = TransactionTable.from_transactions(transactions)
+    expense = np.flatnonzero(table.account_type == AccountType.EXPENSE)
+    if len(expense) == 0:
+        return []
+    
+    month_codes, _ = _month_ids(table.date[expense])
+    frame = pd.DataFrame({
+        "vendor": _vendor_labels(table.vendor[expense]),
+        "amount": np.abs(table.amount[expense]),
+        "account": table.account[expense],
+        "month": np.where(month_codes >= 0, month_codes, np.nan),
     })
     
-    for txn in transactions:
-        if txn.account_type != AccountType.EXPENSE:
-            continue
-        
-        vendor = txn.vendor.strip() if txn.vendor else "Unknown"
-        if vendor in ("", "nan", "None"):
-            vendor = "Unknown"
-        
-        vendor_data[vendor]["total"] += abs(txn.amount)
-        vendor_data[vendor]["count"] += 1
-        vendor_data[vendor]["accounts"].add(txn.account)
-        
-        # Extract month from date
-        try:
-            if "/" in txn.date:
-                month = txn.date.split("/")[0] + "/" + txn.date.split("/")[2]
-            else:
-                month = txn.date[:7]  # YYYY-MM format
-            vendor_data[vendor]["months"].add(month)
-        except:
-            pass
+    # Vendors in first-seen order, as the old dict accumulation produced
+    grouped = frame.groupby("vendor", sort=False)
+    totals = grouped["amount"].sum()
+    counts = grouped["amount"].size()
+    accounts_used = grouped["account"].unique()
+    months_active = grouped["month"].nunique()
     
     # Build vendor analyses
     vendors = []
-    for name, data in vendor_data.items():
-        avg_txn = data["total"] / data["count"] if data["count"] > 0 else 0
-        months_active = len(data["months"])
-        is_recurring = months_active >= 3  # Active 3+ months = recurring
-        
+    for name in totals.index:
+        total = float(totals[name])
+        count = int(counts[name])
+        months = int(months_active[name])
         vendors.append(VendorAnalysis(
             name=name,
-            total_spend=data["total"],
-            transaction_count=data["count"],
-            avg_transaction=avg_txn,
-            accounts_used=list(data["accounts"]),
-            months_active=months_active,
-            is_recurring=is_recurring
+            total_spend=total,
+            transaction_count=count,
+            avg_transaction=total / count if count > 0 else 0,
+            accounts_used=list(accounts_used[name]),
+            months_active=months,
+            is_recurring=months >= 3  # Active 3+ months = recurring
         ))
     
     # Sort by total spend
-    vendors.sort(key=lambda x: x.total_spend, reverse=True)
+    vendors.sort(key=attrgetter("total_spend"), reverse=True)
     return vendors
 
 
+def _month_key(date_str: str) -> Optional[str]:
+    """Bucket a transaction date as MM/YYYY (or YYYY-MM for ISO dates)"""
+    try:
+        if "/" in date_str:
+            parts = date_str.split("/")
+            return f"{parts[0]}/{parts[2]}"  # MM/YYYY
+        return date_str[:7]
+    except:
+        return None
+
+
 def analyze_expense_categories(
     accounts: Dict[str, AccountSummary],
-    transactions: List[Transaction],
+    transactions: Union[List[Transaction], TransactionTable],
     total_revenue: float
 ) -> List[ExpenseCategory]:
-    """Deep analysis of each expense category with variance detection"""
+    """Deep analysis of each expense category with variance detection (accepts a Transaction list or TransactionTable)"""
     
     # Get total expenses for percentage calculation
     total_expenses = sum(
@@ -371,10 +393,14 @@ def analyze_expense_categories(
     
     categories = []
     
-    # Group transactions by account
-    txns_by_account = defaultdict(list)
-    for txn in transactions:
-        txns_by_account[txn.account].append(txn)
+    # Column view of the transactions; each account gets its row positions
+    table = TransactionTable.from_transactions(transactions)
+    idx_by_account = table.rows_by_account()
+    
+    # Encode each transaction's month once; -1 marks dates we can't bucket
+    month_ids, month_labels = _month_ids(table.date)
+    abs_amounts = np.abs(table.amount)
+    vendor_labels = _vendor_labels(table.vendor)
     
     for name, account in accounts.items():
         if account.account_type != AccountType.EXPENSE:
@@ -382,38 +408,34 @@ def analyze_expense_categories(
         if abs(account.total) < 0.01:
             continue
         
-        account_txns = txns_by_account.get(name, [])
+        account_idx = idx_by_account.get(name, np.empty(0, dtype=np.intp))
+        txn_count = len(account_idx)
         
         # Calculate metrics
         pct_of_expenses = (abs(account.total) / total_expenses * 100) if total_expenses else 0
         pct_of_revenue = (abs(account.total) / total_revenue * 100) if total_revenue else 0
-        avg_txn = abs(account.total) / len(account_txns) if account_txns else abs(account.total)
+        avg_txn = abs(account.total) / txn_count if txn_count else abs(account.total)
         
         # Classify (now includes consistency expectation)
         is_fixed, is_discretionary, consistency_expected = classify_expense(name)
         
-        # Get top vendors for this category
-        vendor_totals = defaultdict(float)
-        for txn in account_txns:
-            vendor = txn.vendor.strip() if txn.vendor else "Unknown"
-            if vendor in ("", "nan", "None"):
-                vendor = "Unknown"
-            vendor_totals[vendor] += abs(txn.amount)
+        # Get top vendors for this category (stable sort keeps first-seen order on ties)
+        vendor_codes, vendor_names = pd.factorize(vendor_labels[account_idx])
+        vendor_sums = np.bincount(vendor_codes, weights=abs_amounts[account_idx], minlength=len(vendor_names))
+        top_vendors = [
+            (vendor_names[k], float(vendor_sums[k]))
+            for k in np.argsort(-vendor_sums, kind="stable")[:5]
+        ]
         
-        top_vendors = sorted(vendor_totals.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Monthly trend
-        monthly = defaultdict(float)
-        for txn in account_txns:
-            try:
-                if "/" in txn.date:
-                    parts = txn.date.split("/")
-                    month_key = f"{parts[0]}/{parts[2]}"  # MM/YYYY
-                else:
-                    month_key = txn.date[:7]
-                monthly[month_key] += abs(txn.amount)
-            except:
-                pass
+        # Monthly trend: one weighted bincount per category, months kept in
+        # the order they first appear for this account
+        ids = month_ids[account_idx]
+        has_month = ids >= 0
+        ids = ids[has_month]
+        month_sums = np.bincount(
+            ids, weights=abs_amounts[account_idx][has_month], minlength=len(month_labels)
+        )
+        monthly = {month_labels[k]: float(month_sums[k]) for k in pd.unique(ids)}
         
         # Calculate variance statistics
         monthly_avg, monthly_std, cv, is_consistent = calculate_variance_stats(monthly)
@@ -442,10 +464,10 @@ def analyze_expense_categories(
             total=abs(account.total),
             pct_of_total_expenses=pct_of_expenses,
             pct_of_revenue=pct_of_revenue,
-            transaction_count=len(account_txns),
+            transaction_count=txn_count,
             avg_transaction=avg_txn,
             top_vendors=top_vendors,
-            monthly_trend=dict(monthly),
+            monthly_trend=monthly,
             is_fixed=is_fixed,
             is_discretionary=is_discretionary,
             notes=notes,
@@ -621,7 +643,7 @@ def generate_recommendations(analysis: GAAnalysis) -> List[str]:
         })
     
     # Sort by priority and format
-    recs.sort(key=lambda x: x["priority"])
+    recs.sort(key=itemgetter("priority"))
     
     formatted = []
     total_savings = 0
@@ -648,130 +670,123 @@ def parse_qbo_gl(gl_file: str, account_map: Dict[str, AccountType]) -> Tuple[Dic
     "Total for" lines. This avoids double-counting when transactions post
     to both parent and child accounts.
     """
-    df = pd.read_excel(gl_file, sheet_name=0, header=None)
-    
+    df = read_gl_sheet(gl_file, 0)
+
     accounts = {}
     all_transactions = []
     current_account = None
     current_account_type = AccountType.UNKNOWN
-    
+
+    # Index the CoA once so the fallback matching below is a dict probe per
+    # account header instead of a scan over the whole mapping.
+    # setdefault keeps the first CoA entry that matches, same as the old loops.
+    by_suffix = {}      # full name and every ":"-suffix (e.g. "Sales" for "SALES INCOME:Sales")
+    by_suffix_ci = {}   # lowercased ":"-suffixes
+    by_segment_ci = {}  # any lowercased path segment
+    for mapped_name, mapped_type in account_map.items():
+        by_suffix.setdefault(mapped_name, mapped_type)
+        segments = mapped_name.split(":")
+        for i in range(1, len(segments)):
+            suffix = ":".join(segments[i:])
+            by_suffix.setdefault(suffix, mapped_type)
+            by_suffix_ci.setdefault(suffix.lower(), mapped_type)
+        for segment in segments:
+            by_segment_ci.setdefault(segment.lower(), mapped_type)
+
+    # Plain object array: indexing it avoids building a Series per row
+    values = df.to_numpy(dtype=object)
+    n_rows, n_cols = values.shape
+
     # Find header row (contains "Date", "Transaction Type", etc.)
     header_row = 4  # Default QBO position
-    for i, row in df.iterrows():
-        row_values = [str(v) for v in row.values if pd.notna(v)]
+    for i in range(n_rows):
+        row_values = [str(v) for v in values[i] if pd.notna(v)]
         row_str = ' '.join(row_values)
         if 'Date' in row_str and 'Transaction' in row_str:
             header_row = i
             break
-    
-    # Parse accounts and transactions
-    for i, row in df.iterrows():
-        if i <= header_row:
-            continue
-        
-        col0 = str(row[0]).strip() if pd.notna(row[0]) else ""
-        col1_raw = row[1]
-        col1 = str(row[1]).strip() if pd.notna(row[1]) else ""
-        
-        # Skip "nan" strings
-        if col0 == "nan":
-            col0 = ""
-        if col1 == "nan":
-            col1 = ""
-        
-        # Skip completely empty rows
-        if not col0 and not col1:
-            continue
-        
-        # Skip all "Total for" lines - we'll calculate totals from transactions
-        if col0.startswith("Total for "):
-            continue
-        
-        # Check if this is an account header
-        # Account headers have: value in col0, nothing meaningful in col1 (or "Beginning Balance")
-        if col0 and not col0.startswith("Total"):
-            is_account_header = False
-            
-            if pd.isna(col1_raw) or col1 == "" or col1 == "Beginning Balance":
-                is_account_header = True
-            
-            if is_account_header:
-                current_account = col0
-                current_account_type = account_map.get(current_account, AccountType.UNKNOWN)
-                
-                # Try smarter matching if exact match fails
-                if current_account_type == AccountType.UNKNOWN:
-                    # Priority 1: Account name matches end of CoA path (e.g., "Sales" matches "SALES INCOME:Sales")
-                    for mapped_name, mapped_type in account_map.items():
-                        if mapped_name.endswith(":" + current_account) or mapped_name == current_account:
-                            current_account_type = mapped_type
-                            break
-                    
-                    # Priority 2: CoA path ends with account name (case-insensitive)
-                    if current_account_type == AccountType.UNKNOWN:
-                        for mapped_name, mapped_type in account_map.items():
-                            if mapped_name.lower().endswith(":" + current_account.lower()):
-                                current_account_type = mapped_type
-                                break
-                    
-                    # Priority 3: Account name is a significant part of CoA name (not just substring)
-                    if current_account_type == AccountType.UNKNOWN:
-                        for mapped_name, mapped_type in account_map.items():
-                            # Split CoA path and check if account matches any segment
-                            segments = mapped_name.split(":")
-                            if current_account in segments or current_account.lower() in [s.lower() for s in segments]:
-                                current_account_type = mapped_type
-                                break
-                
-                if current_account not in accounts:
-                    accounts[current_account] = AccountSummary(
-                        name=current_account,
-                        account_type=current_account_type,
-                        total=0,
-                        transaction_count=0,
-                        transactions=[]
-                    )
-                continue
-        
-        # Transaction row: has a date in col1
-        if current_account and col1 and col1 != "Beginning Balance":
-            # Parse date
-            date_str = col1
-            if hasattr(col1_raw, 'strftime'):
-                date_str = col1_raw.strftime('%m/%d/%Y')
-            
-            # Get transaction details
-            vendor = str(row[5]).strip() if len(row) > 5 and pd.notna(row[5]) else ""
-            if vendor == "nan":
-                vendor = ""
-            description = str(row[6]).strip() if len(row) > 6 and pd.notna(row[6]) else ""
-            if description == "nan":
-                description = ""
-            
-            # Amount is in column 8
-            amount = 0
-            try:
-                if len(row) > 8 and pd.notna(row[8]):
-                    amount = float(row[8])
-            except:
-                pass
-            
-            txn = Transaction(
-                date=date_str,
+
+    # A GL needs at least the account and date columns
+    if n_cols < 2:
+        return accounts, all_transactions
+
+    # Normalize the text columns once up front instead of per row
+    col0_text = clean_text_column(df.iloc[:, 0])
+    col1_text = clean_text_column(df.iloc[:, 1])
+    vendor_text = clean_text_column(df.iloc[:, 5]) if n_cols > 5 else None
+    desc_text = clean_text_column(df.iloc[:, 6]) if n_cols > 6 else None
+
+    # Amounts coerced once for the whole column; anything non-numeric is 0
+    if n_cols > 8:
+        amounts = pd.to_numeric(df.iloc[:, 8], errors="coerce").fillna(0.0).to_numpy(np.float64)
+    else:
+        amounts = np.zeros(n_rows, dtype=np.float64)
+
+    # Account headers have: value in col0, nothing meaningful in col1 (or
+    # "Beginning Balance"). Transaction rows have a date in col1. "Total for"
+    # lines are skipped - we calculate totals from transactions.
+    c0 = pd.Series(col0_text)
+    c1 = pd.Series(col1_text)
+    in_body = np.arange(n_rows) > header_row
+    is_header = in_body & (
+        (c0 != "") & ~c0.str.startswith("Total") & c1.isin(["", "Beginning Balance"])
+    ).to_numpy(dtype=bool)
+    is_txn = in_body & ~is_header & (
+        ~c0.str.startswith("Total for ") & (c1 != "") & (c1 != "Beginning Balance")
+    ).to_numpy(dtype=bool)
+
+    # Rows between two headers all belong to the first one, so walk the
+    # headers and build each segment's transactions in one go
+    header_rows = np.flatnonzero(is_header)
+    txn_rows = np.flatnonzero(is_txn)
+    segment_ends = np.searchsorted(txn_rows, np.r_[header_rows[1:], n_rows])
+    segment_start = np.searchsorted(txn_rows, header_rows[0]) if len(header_rows) else 0
+
+    for h, segment_end in zip(header_rows, segment_ends):
+        current_account = col0_text[h]
+        current_account_type = account_map.get(current_account, AccountType.UNKNOWN)
+
+        # Try smarter matching if exact match fails
+        if current_account_type == AccountType.UNKNOWN:
+            # Priority 1: Account name matches end of CoA path (e.g., "Sales" matches "SALES INCOME:Sales")
+            current_account_type = by_suffix.get(current_account, AccountType.UNKNOWN)
+
+            # Priority 2: CoA path ends with account name (case-insensitive)
+            if current_account_type == AccountType.UNKNOWN:
+                current_account_type = by_suffix_ci.get(current_account.lower(), AccountType.UNKNOWN)
+
+            # Priority 3: Account name is a significant part of CoA name (not just substring)
+            if current_account_type == AccountType.UNKNOWN:
+                current_account_type = by_segment_ci.get(current_account.lower(), AccountType.UNKNOWN)
+
+        if current_account not in accounts:
+            accounts[current_account] = AccountSummary(
+                name=current_account,
+                account_type=current_account_type,
+                total=0,
+                transaction_count=0,
+                transactions=[]
+            )
+
+        segment = txn_rows[segment_start:segment_end]
+        segment_start = segment_end
+        txns = [
+            Transaction(
+                date=values[i, 1].strftime('%m/%d/%Y') if hasattr(values[i, 1], 'strftime') else col1_text[i],
                 account=current_account,
                 account_type=current_account_type,
-                description=description,
-                amount=amount,
-                vendor=vendor
+                description=desc_text[i] if desc_text is not None else "",
+                amount=float(amounts[i]),
+                vendor=vendor_text[i] if vendor_text is not None else ""
             )
-            all_transactions.append(txn)
-            
-            if current_account in accounts:
-                accounts[current_account].transactions.append(txn)
-                accounts[current_account].transaction_count += 1
-    
-    # Calculate totals from transactions (not from "Total for" lines)
-    for account_name, account in accounts.items():
+            for i in segment
+        ]
+        all_transactions.extend(txns)
+        accounts[current_account].transactions.extend(txns)
+
+    # Calculate counts and totals from transactions (not from "Total for" lines)
+    for account in accounts.values():
+        account.transaction_count = len(account.transactions)
         account.total = sum(txn.amount for txn in account.transactions)
     
     return accounts, all_transactions
@@ -807,22 +822,33 @@ def run_ga_analysis(
     
     # Get revenue if not provided
     if total_revenue is None:
-        total_revenue = sum(abs(v) for v in pnl["Revenue"].values())
+        total_revenue = sum(map(abs, pnl["Revenue"].values()))
     
     # Total G&A
-    total_ga = sum(abs(v) for v in pnl["Expenses"].values())
+    total_ga = sum(map(abs, pnl["Expenses"].values()))
     ga_pct = (total_ga / total_revenue * 100) if total_revenue else 0
     
+    # Column view shared by the category and vendor analyses
+    table = TransactionTable.from_transactions(transactions)
+    
     # Analyze categories
-    categories = analyze_expense_categories(accounts, transactions, total_revenue)
+    categories = analyze_expense_categories(accounts, table, total_revenue)
     
     # Analyze vendors
-    vendors = analyze_vendors(transactions)
+    vendors = analyze_vendors(table)
     
-    # Calculate cost structure
-    fixed_costs = sum(c.total for c in categories if c.is_fixed)
+    # Cost structure and monthly totals in one pass over the categories
+    fixed_costs = 0
+    discretionary = 0
+    monthly = defaultdict(float)
+    for cat in categories:
+        if cat.is_fixed:
+            fixed_costs += cat.total
+        if cat.is_discretionary:
+            discretionary += cat.total
+        for month, amt in cat.monthly_trend.items():
+            monthly[month] += amt
     variable_costs = total_ga - fixed_costs
-    discretionary = sum(c.total for c in categories if c.is_discretionary)
     essential = total_ga - discretionary
     
     # Unknown vendors
@@ -830,12 +856,6 @@ def run_ga_analysis(
     unknown_total = unknown.total_spend if unknown else 0
     unknown_count = unknown.transaction_count if unknown else 0
     
-    # Monthly totals
-    monthly = defaultdict(float)
-    for cat in categories:
-        for month, amt in cat.monthly_trend.items():
-            monthly[month] += amt
-    
     # Build analysis object
     analysis = GAAnalysis(
         total_ga_expenses=total_ga,
@@ -900,9 +920,7 @@ def format_ga_report(analysis: GAAnalysis) -> str:
             if cat.monthly_std > 0:
                 lines.append(f"    Range: {format_currency(cat.monthly_avg - cat.monthly_std)} - {format_currency(cat.monthly_avg + cat.monthly_std)}")
             if cat.monthly_trend:
-                sorted_months = sorted(cat.monthly_trend.items())
-                min_month = min(sorted_months, key=lambda x: x[1])
-                max_month = max(sorted_months, key=lambda x: x[1])
+                min_month, max_month = cat.month_extremes()
                 lines.append(f"    Low: {min_month[0]} ({format_currency(min_month[1])}) | High: {max_month[0]} ({format_currency(max_month[1])})")
             if cat.top_vendors and cat.top_vendors[0][0] != "Unknown":
                 lines.append(f"    Top Vendor: {cat.top_vendors[0][0]}")
@@ -919,8 +937,7 @@ def format_ga_report(analysis: GAAnalysis) -> str:
             lines.append(f"    Total: {format_currency(cat.total)} ({cat.pct_of_revenue:.1f}% of revenue)")
             lines.append(f"    Variance: {cat.coefficient_of_variation:.0%} | Transactions: {cat.transaction_count}")
             if cat.monthly_trend:
-                sorted_months = sorted(cat.monthly_trend.items())
-                trend_str = " → ".join([f"{m[0][:3]}: {format_currency(m[1])}" for m in sorted_months[-3:]])
+                trend_str = " → ".join([f"{m[0][:3]}: {format_currency(m[1])}" for m in cat.sorted_months()[-3:]])
                 lines.append(f"    Recent: {trend_str}")
             if cat.top_vendors:
                 vendors_str = ", ".join([f"{v[0]} ({format_currency(v[1])})" for v in cat.top_vendors[:3] if v[0] != "Unknown"])
@@ -938,7 +955,7 @@ def format_ga_report(analysis: GAAnalysis) -> str:
         consistent_total = sum(c.total for c in consistent)
         lines.append(f"Total: {format_currency(consistent_total)} across {len(consistent)} categories")
         lines.append("These are stable month-to-month as expected:\n")
-        for cat in sorted(consistent, key=lambda x: -x.total)[:8]:
+        for cat in sorted(consistent, key=attrgetter("total"), reverse=True)[:8]:
             status = "✓" if cat.coefficient_of_variation < 0.10 else "~"
             lines.append(f"  {status} {cat.name}: {format_currency(cat.total)} (CV: {cat.coefficient_of_variation:.0%})")
         if len(consistent) > 8:
@@ -954,8 +971,9 @@ def format_ga_report(analysis: GAAnalysis) -> str:
     
     lines.append(f"\n📅 MONTHLY TREND")
     lines.append("-" * 50)
+    monthly_max = max(analysis.monthly_totals.values()) if analysis.monthly_totals else 0
     for month, total in sorted(analysis.monthly_totals.items()):
-        bar_len = int(total / max(analysis.monthly_totals.values()) * 30) if analysis.monthly_totals else 0
+        bar_len = int(total / monthly_max * 30)
         lines.append(f"  {month}: {format_currency(total)} {'█' * bar_len}")
     
     lines.append(f"\n💡 INSIGHTS")
@@ -5,18 +5,33 @@ Preserves transaction detail for AI analysis
 """
 
 import pandas as pd
+import numpy as np
 import json
+import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass
-import requests
 import os
+from functools import lru_cache, cached_property
+from bisect import bisect_left
 
 # Import AccountType from coa_parser to ensure single enum definition
 from coa_parser import AccountType
 
+# Leading account number on GL headers, e.g. "1000 Rent" or "1000 - Rent"
+_ACCT_NUM_RE = re.compile(r'^\d+[\s\-]+')
 
-@dataclass
+_TOTAL_PREFIX = "Total "
+TOTAL_FOR_PREFIX = "Total for "
+_BEGINNING_BALANCE = "Beginning Balance"
+
+# GL column-header row: mentions a date plus a type/transaction/amount column
+HEADER_DATE_RE = re.compile(r'date', re.I)
+HEADER_GL_RE = re.compile(r'type|transaction|amount', re.I)
+_SHEET_GL_RE = re.compile(r'transaction|amount', re.I)
+
+
+@dataclass(slots=True)
 class Transaction:
     date: str
     account: str
@@ -26,7 +41,7 @@ class Transaction:
     vendor: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AccountSummary:
     name: str
     account_type: AccountType
@@ -35,61 +50,312 @@ class AccountSummary:
     transactions: List[Transaction]
 
 
-def load_account_mapping(mapping_file: str) -> Dict[str, AccountType]:
-    """Load the Chart of Accounts mapping"""
-    with open(mapping_file, 'r') as f:
+@dataclass
+class TransactionTable:
+    """
+    Column-oriented (structure-of-arrays) view of a transaction list.
+
+    One NumPy array per Transaction field, so downstream analysis can use
+    vectorized reductions instead of walking dataclass objects.
+    """
+    date: np.ndarray
+    account: np.ndarray
+    account_type: np.ndarray
+    description: np.ndarray
+    amount: np.ndarray
+    vendor: np.ndarray
+
+    @classmethod
+    def from_transactions(cls, transactions: Union[List[Transaction], "TransactionTable"]) -> "TransactionTable":
+        if isinstance(transactions, TransactionTable):
+            return transactions
+        return cls(
+            date=np.array([t.date for t in transactions], dtype=object),
+            account=np.array([t.account for t in transactions], dtype=object),
+            account_type=np.array([t.account_type for t in transactions], dtype=object),
+            description=np.array([t.description for t in transactions], dtype=object),
+            amount=np.array([t.amount for t in transactions], dtype=np.float64),
+            vendor=np.array([t.vendor for t in transactions], dtype=object),
+        )
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    @cached_property
+    def account_codes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Categorical encoding of the account column: an integer code per row
+        plus the distinct account names in first-seen order. Computed once per
+        table and shared by every grouping below.
+        """
+        codes, names = pd.factorize(self.account)
+        return codes, np.asarray(names, dtype=object)
+
+    def rows_by_account(self) -> Dict[str, np.ndarray]:
+        """Row positions of each account's transactions, in original order"""
+        codes, names = self.account_codes
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(1, len(names)))
+        return dict(zip(names.tolist(), np.split(order, bounds)))
+
+    def to_transactions(self) -> List[Transaction]:
+        """Materialize Transaction objects for callers that need them"""
+        return [
+            Transaction(date=d, account=a, account_type=t, description=desc, amount=amt, vendor=v)
+            for d, a, t, desc, amt, v in zip(
+                self.date, self.account, self.account_type,
+                self.description, self.amount.tolist(), self.vendor
+            )
+        ]
+
+
+@lru_cache(maxsize=32)
+def _load_account_mapping_cached(path: str, mtime_ns: int, size: int) -> Dict[str, AccountType]:
+    with open(path, 'r') as f:
         data = json.load(f)
     return {k: AccountType(v) for k, v in data.items()}
 
 
+def load_account_mapping(mapping_file: str) -> Dict[str, AccountType]:
+    """
+    Load the Chart of Accounts mapping
+
+    Cached per path/mtime/size, so batch runs against one mapping only parse
+    it once; each call gets its own copy.
+    """
+    path = os.path.abspath(mapping_file)
+    stat = os.stat(path)
+    return dict(_load_account_mapping_cached(path, stat.st_mtime_ns, stat.st_size))
+
+
+# Rust-based reader, several times faster than openpyxl on large GLs.
+# Falls back to pandas' default engine when python-calamine isn't installed.
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+
+# Two entries: one run reads the same upload by sheet name (parse_gl_with_mapping)
+# and by index (validation, expense_analyzer). Whole GL frames are large, and
+# uploads land on fresh temp paths, so keeping more only pins deleted files.
+@lru_cache(maxsize=2)
+def _read_sheet_cached(path: str, sheet_name, mtime_ns: int, size: int) -> pd.DataFrame:
+    """Read one sheet; mtime/size are part of the key so edited files are re-read"""
+    return pd.read_excel(path, sheet_name=sheet_name, header=None, engine=EXCEL_ENGINE)
+
+
+def read_gl_sheet(gl_file: str, sheet_name=0) -> pd.DataFrame:
+    """
+    Read a GL sheet as raw rows (header=None).
+
+    The last couple of sheets read are kept in memory keyed by path, mtime and
+    size, so the analysis steps of one run only parse the workbook once.
+    The returned frame is shared - treat it as read-only.
+    """
+    path = os.path.abspath(gl_file)
+    stat = os.stat(path)
+    return _read_sheet_cached(path, sheet_name, stat.st_mtime_ns, stat.st_size)
+
+
+def clean_text_column(column: pd.Series) -> np.ndarray:
+    """
+    Whole-column str().strip(), with '' for blanks and the literal 'nan'.
+
+    Repeated values (account names, vendors) share one str object, so the
+    transactions built from them don't each hold their own copy.
+    """
+    text = column.astype(str).str.strip()
+    text = text.where(column.notna() & (text != "nan"), "").to_numpy(dtype=object)
+    codes, uniques = pd.factorize(text)
+    return np.asarray(uniques, dtype=object)[codes]
+
+
+def _is_missing(value) -> bool:
+    """Scalar NaN/None check without the pd.isna dispatch overhead"""
+    return value is None or value != value
+
+
+def _parse_amount_cells(column: np.ndarray, parens_negative: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a column of GL amount cells in bulk.
+
+    Text has "," and "$" stripped (and "(x)" turned into "-x" when
+    parens_negative) before conversion; text left empty counts as 0.
+    Returns (amounts, present, parsed): present marks non-missing cells,
+    parsed marks cells that converted cleanly.
+    """
+    amounts = np.full(len(column), np.nan)
+    present = ~pd.isna(column)
+    is_text = np.array([isinstance(v, str) for v in column], dtype=bool)
+    
+    cleaned = pd.Series(column, dtype=object)
+    if is_text.any():
+        text = cleaned[is_text].str.replace(",", "", regex=False).str.replace("$", "", regex=False)
+        if parens_negative:
+            text = text.str.replace("(", "-", regex=False).str.replace(")", "", regex=False)
+        cleaned[is_text] = text
+    amounts[present] = pd.to_numeric(cleaned[present], errors="coerce").to_numpy(dtype=float)
+    parsed = present & ~np.isnan(amounts)
+    if is_text.any():
+        empty = is_text & (cleaned == "").to_numpy(dtype=bool)
+        amounts[empty] = 0.0
+        parsed |= empty
+    
+    # to_numeric is stricter than float() on a few spellings ("nan", "1_000")
+    for i in np.flatnonzero(present & ~parsed):
+        try:
+            amounts[i] = float(cleaned.iat[i])
+            parsed[i] = True
+        except (TypeError, ValueError):
+            pass
+    
+    return amounts, present, parsed
+
+
+def _transaction_amounts(rows: np.ndarray, amount_col, debit_col, credit_col) -> np.ndarray:
+    """
+    Resolve the amount of each transaction row.
+
+    Uses the amount column when it has a value, otherwise debit - credit,
+    otherwise the first non-zero number in the last three columns.
+    Unparseable cells give 0.
+    """
+    n_rows, n_cols = rows.shape
+    amounts = np.zeros(n_rows)
+    remaining = np.ones(n_rows, dtype=bool)
+    
+    # Strategy 1: Use detected amount column
+    if amount_col and n_cols > amount_col:
+        values, present, parsed = _parse_amount_cells(rows[:, amount_col])
+        amounts[present & parsed] = values[present & parsed]
+        remaining = ~present
+    
+    # Strategy 2: Use debit/credit columns
+    if debit_col is not None or credit_col is not None:
+        net = np.zeros(n_rows)
+        failed = np.zeros(n_rows, dtype=bool)
+        for col, sign in ((debit_col, 1), (credit_col, -1)):
+            if col and n_cols > col:
+                values, present, parsed = _parse_amount_cells(rows[:, col], parens_negative=False)
+                net += sign * np.where(present & parsed, values, 0)
+                failed |= present & ~parsed
+        amounts[remaining] = np.where(failed, 0, net)[remaining]
+        return amounts
+    
+    # Strategy 3: Search last few columns for a number
+    for col_idx in range(n_cols - 1, max(0, n_cols - 4), -1):
+        values, present, parsed = _parse_amount_cells(rows[:, col_idx])
+        found = remaining & present & parsed & (values != 0)
+        amounts[found] = values[found]
+        remaining &= ~found
+    
+    return amounts
+
+
+def _normalize_date(value, dayfirst: bool) -> str:
+    """Normalize one GL date cell; anything that won't parse is kept as-is (stripped)"""
+    if _is_missing(value):
+        return ""
+    try:
+        if hasattr(value, 'strftime'):
+            return value.strftime('%Y-%m-%d')
+        return pd.to_datetime(value, dayfirst=dayfirst).strftime('%Y-%m-%d')
+    except Exception:
+        # Fallback: keep original string
+        return str(value).strip()
+
+
+def _normalize_dates(raw: np.ndarray, dayfirst: bool) -> np.ndarray:
+    """
+    Normalize a column of GL date cells to YYYY-MM-DD strings in bulk.
+
+    Excel date cells are formatted directly. Text is parsed with the usual
+    QBO layout first, then pandas' per-value inference for anything left.
+    Text that still doesn't parse is kept as-is (stripped); blanks become "".
+    If a bulk step fails outright, its cells go through _normalize_date.
+    """
+    dates = np.full(len(raw), "", dtype=object)
+    if len(raw) == 0:
+        return dates
+    
+    is_cell = np.array([hasattr(v, 'strftime') and not _is_missing(v) for v in raw], dtype=bool)
+    is_text = np.array([isinstance(v, str) for v in raw], dtype=bool)
+    
+    cells = np.flatnonzero(is_cell)
+    if len(cells):
+        # Per-cell strftime: to_datetime would reject time-only cells and
+        # years outside the datetime64[ns] range
+        dates[cells] = [_normalize_date(v, dayfirst) for v in raw[cells]]
+    
+    texts = np.flatnonzero(is_text)
+    if len(texts):
+        text = pd.Series(raw[texts], dtype=object)
+        try:
+            parsed = pd.to_datetime(text, format="%d/%m/%Y" if dayfirst else "%m/%d/%Y", errors="coerce")
+            retry = parsed.isna()
+            if retry.any():
+                parsed[retry] = pd.to_datetime(text[retry], dayfirst=dayfirst, format="mixed", errors="coerce")
+            dates[texts] = np.where(parsed.notna(), parsed.dt.strftime('%Y-%m-%d'), text.str.strip())
+        except Exception:
+            # e.g. mixed time zones, which errors="coerce" doesn't cover
+            dates[texts] = [_normalize_date(v, dayfirst) for v in raw[texts]]
+    
+    # Anything else (numbers etc.) is rare - parse those one at a time
+    for i in np.flatnonzero(~is_cell & ~is_text):
+        dates[i] = _normalize_date(raw[i], dayfirst)
+    
+    return dates
+
+
 def detect_date_format(df, date_col=1) -> bool:
     """
     Detect if dates are in day-first format (DD/MM/YYYY) or month-first (MM/DD/YYYY).
     Returns True if day-first format detected.
     """
-    for i, row in df.iterrows():
-        if i < 5:  # Skip header rows
-            continue
-        if pd.notna(row[date_col]):
-            date_str = str(row[date_col]).strip()
-            if '/' in date_str:
-                parts = date_str.split('/')
-                if len(parts) >= 2:
-                    first_num = int(parts[0]) if parts[0].isdigit() else 0
-                    # If first number > 12, it must be a day (DD/MM/YYYY)
-                    if first_num > 12:
-                        return True
-    return False  # Default to MM/DD/YYYY
+    # Leading number of every "N/..." date below the header rows; if any is
+    # > 12 it must be a day (DD/MM/YYYY). Otherwise default to MM/DD/YYYY.
+    dates = df.iloc[5:][date_col].dropna().astype(str).str.strip()
+    first_nums = pd.to_numeric(dates.str.extract(r'^(\d+)/', expand=False), errors='coerce')
+    return bool((first_nums > 12).any())
+
+
+@lru_cache(maxsize=32)
+def _find_gl_sheet_cached(path: str, mtime_ns: int, size: int):
+    # One open workbook serves the sheet list and every preview below
+    with pd.ExcelFile(path, engine=EXCEL_ENGINE) as xl:
+        # Priority order for GL sheet names
+        gl_keywords = ['general ledger', 'gl', 'ytd gl', 'historic gl', 'ledger']
+        
+        # First, try exact/partial matches
+        for sheet in xl.sheet_names:
+            sheet_lower = sheet.lower()
+            for keyword in gl_keywords:
+                if keyword in sheet_lower:
+                    return sheet
+        
+        # If no match found, check each sheet for GL-like structure
+        for sheet in xl.sheet_names:
+            try:
+                df = xl.parse(sheet_name=sheet, header=None, nrows=20)
+                # Look for GL-like headers (Date, Transaction Type, Amount)
+                for row in df.to_numpy(dtype=object):
+                    row_str = ' '.join([str(v) for v in row if not _is_missing(v)])
+                    if HEADER_DATE_RE.search(row_str) and _SHEET_GL_RE.search(row_str):
+                        return sheet
+            except:
+                pass
+        
+        # Default to first sheet
+        return xl.sheet_names[0]
 
 
 def find_gl_sheet(file_path: str) -> str:
     """Find the sheet containing General Ledger data"""
-    xl = pd.ExcelFile(file_path)
-    
-    # Priority order for GL sheet names
-    gl_keywords = ['general ledger', 'gl', 'ytd gl', 'historic gl', 'ledger']
-    
-    # First, try exact/partial matches
-    for sheet in xl.sheet_names:
-        sheet_lower = sheet.lower()
-        for keyword in gl_keywords:
-            if keyword in sheet_lower:
-                return sheet
-    
-    # If no match found, check each sheet for GL-like structure
-    for sheet in xl.sheet_names:
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet, header=None, nrows=20)
-            # Look for GL-like headers (Date, Transaction Type, Amount)
-            for i, row in df.iterrows():
-                row_str = ' '.join([str(v).lower() for v in row.values if pd.notna(v)])
-                if 'date' in row_str and ('transaction' in row_str or 'amount' in row_str):
-                    return sheet
-        except:
-            pass
-    
-    # Default to first sheet
-    return xl.sheet_names[0]
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return _find_gl_sheet_cached(path, stat.st_mtime_ns, stat.st_size)
 
 
 def parse_gl_with_mapping(gl_file: str, account_map: Dict[str, AccountType], date_format: str = "auto") -> Tuple[Dict[str, AccountSummary], List[Transaction]]:
@@ -104,7 +370,7 @@ def parse_gl_with_mapping(gl_file: str, account_map: Dict[str, AccountType], dat
     # Find the correct sheet
     sheet_name = find_gl_sheet(gl_file)
     
-    df = pd.read_excel(gl_file, sheet_name=sheet_name, header=None)
+    df = read_gl_sheet(gl_file, sheet_name)
     
     # Determine date format
     if date_format == "dmy":
@@ -114,6 +380,36 @@ def parse_gl_with_mapping(gl_file: str, account_map: Dict[str, AccountType], dat
     else:  # auto
         dayfirst = detect_date_format(df)
     
+    # Index the CoA once so each lookup below is a few dict probes rather
+    # than a scan of account_map. setdefault keeps the first CoA entry that
+    # matches, same as scanning in order.
+    by_lower = {}   # lowercased full name
+    by_child = {}   # lowercased ":"-suffixes and stripped last segment
+    coa_lowers = []
+    for coa_name, coa_type in account_map.items():
+        coa_lower = coa_name.lower()
+        by_lower.setdefault(coa_lower, coa_type)
+        if ":" in coa_lower:
+            segments = coa_lower.split(":")
+            for i in range(1, len(segments)):
+                by_child.setdefault(":".join(segments[i:]), coa_type)
+            by_child.setdefault(segments[-1].strip(), coa_type)
+        coa_lowers.append((coa_lower, coa_type))
+    lookup_cache = {}
+    
+    # Names that have sub-accounts in the CoA, and sorted names for prefix tests
+    coa_parents = set()
+    for coa_name in account_map:
+        pos = coa_name.find(":")
+        while pos != -1:
+            coa_parents.add(coa_name[:pos])
+            pos = coa_name.find(":", pos + 1)
+    coa_sorted = sorted(account_map)
+    
+    def coa_has_prefix(prefix: str) -> bool:
+        idx = bisect_left(coa_sorted, prefix)
+        return idx < len(coa_sorted) and coa_sorted[idx].startswith(prefix)
+
     # Helper function to match bilingual account names
     def lookup_account_type(name: str) -> AccountType:
         """Look up account type, handling various naming conventions:
@@ -121,6 +417,13 @@ def parse_gl_with_mapping(gl_file: str, account_map: Dict[str, AccountType], dat
         - Parent:Child where GL has just Child (e.g., 'Membership Sales' vs 'Services Income:Membership Sales')
         - Account numbers stripped or present
         """
+        if name in lookup_cache:
+            return lookup_cache[name]
+        account_type = _match_account_type(name)
+        lookup_cache[name] = account_type
+        return account_type
+
+    def _match_account_type(name: str) -> AccountType:
         # Direct match
         if name in account_map:
             return account_map[name]
@@ -132,33 +435,23 @@ def parse_gl_with_mapping(gl_file: str, account_map: Dict[str, AccountType], dat
                 part = part.strip()
                 if part in account_map:
                     return account_map[part]
-                for coa_name, coa_type in account_map.items():
-                    if coa_name.lower() == part.lower():
-                        return coa_type
+                if part.lower() in by_lower:
+                    return by_lower[part.lower()]
         
         name_lower = name.lower()
         
         # Case-insensitive match
-        for coa_name, coa_type in account_map.items():
-            if coa_name.lower() == name_lower:
-                return coa_type
+        if name_lower in by_lower:
+            return by_lower[name_lower]
         
         # Check if GL name matches the end of a COA parent:child name
         # e.g., "Membership Sales - Mariana Tek" matches "Services Income:Membership Sales - Mariana Tek"
-        for coa_name, coa_type in account_map.items():
-            coa_lower = coa_name.lower()
-            # Match if COA ends with :GL_name
-            if coa_lower.endswith(":" + name_lower):
-                return coa_type
-            # Match if GL name is contained after a colon
-            if ":" in coa_lower:
-                coa_child = coa_lower.split(":")[-1].strip()
-                if coa_child == name_lower:
-                    return coa_type
+        if name_lower in by_child:
+            return by_child[name_lower]
         
         # Check if COA name is contained in GL name (for bilingual)
-        for coa_name, coa_type in account_map.items():
-            if coa_name.lower() in name_lower:
+        for coa_lower, coa_type in coa_lowers:
+            if coa_lower in name_lower:
                 return coa_type
         
         return AccountType.UNKNOWN
@@ -172,13 +465,18 @@ def parse_gl_with_mapping(gl_file: str, account_map: Dict[str, AccountType], dat
     header_row = None
     header_cols = {}  # Map column names to indices
     
-    for i, row in df.iterrows():
-        row_str = ' '.join([str(v).lower() for v in row.values if pd.notna(v)])
-        if 'date' in row_str and ('type' in row_str or 'transaction' in row_str or 'amount' in row_str):
+    # Plain object array: indexing it avoids building a Series per row
+    values = df.to_numpy(dtype=object)
+    n_rows, n_cols = values.shape
+
+    for i in range(n_rows):
+        row = values[i]
+        row_str = ' '.join([str(v) for v in row if not _is_missing(v)])
+        if HEADER_DATE_RE.search(row_str) and HEADER_GL_RE.search(row_str):
             header_row = i
             # Map column names to indices
-            for j, val in enumerate(row.values):
-                if pd.notna(val):
+            for j, val in enumerate(row):
+                if not _is_missing(val):
                     col_name = str(val).strip().lower()
                     header_cols[col_name] = j
             break
@@ -205,219 +503,183 @@ def parse_gl_with_mapping(gl_file: str, account_map: Dict[str, AccountType], dat
     debit_col = find_col(['debit'], None)
     credit_col = find_col(['credit'], None)
     
-    # Track parent accounts for nested sub-accounts
+    # A GL needs at least the account and date columns
+    if n_cols < 2:
+        return accounts, all_transactions
+
+    # Normalize the text columns once up front instead of per row
+    def text_column(idx):
+        return clean_text_column(df.iloc[:, idx]) if idx and n_cols > idx else None
+    
+    col0_text = clean_text_column(df.iloc[:, 0])
+    col1_text = clean_text_column(df.iloc[:, 1])
+    vendor_text = text_column(vendor_col)
+    desc_text = text_column(desc_col)
+    split_text = text_column(split_col)
+    
+    # Classify every row up front with vectorized string ops
+    c0 = pd.Series(col0_text)
+    c1 = pd.Series(col1_text)
+    in_body = np.arange(n_rows) > header_row
+    is_total_for = in_body & c0.str.startswith(TOTAL_FOR_PREFIX).to_numpy(dtype=bool)
+    is_header = in_body & (
+        (c0 != "") & c1.isin(["", _BEGINNING_BALANCE]) & ~c0.str.startswith("Total")
+    ).to_numpy(dtype=bool)
+    is_txn = in_body & ~is_header & (
+        ~c0.str.startswith(_TOTAL_PREFIX) & (c1 != "") & (c1 != _BEGINNING_BALANCE)
+    ).to_numpy(dtype=bool)
+    
+    # Resolve account headers in order; only these rows (and the "Total for"
+    # rows that close parents) drive the parent-stack state machine
     parent_account_stack = []  # Stack to track parent hierarchy
+    header_accounts = {}  # row -> (account name, account type)
+    for i in np.flatnonzero(is_header | is_total_for):
+        col0 = col0_text[i]
+        
+        # Handle "Total for X" lines - pop parent when we see total
+        if is_total_for[i]:
+            total_name = col0.replace(TOTAL_FOR_PREFIX, "").replace(" with sub-accounts", "").strip()
+            # Pop the matching parent (and anything above it) off the stack
+            total_lower = total_name.lower()
+            for depth in range(len(parent_account_stack) - 1, -1, -1):
+                if parent_account_stack[depth].lower() == total_lower:
+                    del parent_account_stack[depth:]
+                    break
+            continue
+        
+        # This is an account name - could be parent or sub-account
+        raw_account_name = col0.strip()
+        
+        # Try to find as "Parent:SubAccount" first
+        full_account_name = raw_account_name
+        if parent_account_stack:
+            # Try with parent prefix
+            for depth in range(len(parent_account_stack), 0, -1):
+                parent_path = ":".join(parent_account_stack[:depth])
+                test_name = f"{parent_path}:{raw_account_name}"
+                if test_name in account_map:
+                    full_account_name = test_name
+                    break
+        
+        # Look up type using smart matching (handles bilingual names)
+        account_type = lookup_account_type(full_account_name)
+        
+        # Try additional matching if still unknown
+        if account_type == AccountType.UNKNOWN:
+            # Try stripping account number prefix (e.g., "1000 Rent" -> "Rent")
+            stripped_name = _ACCT_NUM_RE.sub('', full_account_name).strip()
+            if stripped_name and stripped_name != full_account_name:
+                account_type = lookup_account_type(stripped_name)
+        
+        header_accounts[i] = (full_account_name, account_type)
+        
+        # Track as potential parent (might have sub-accounts)
+        # Check if this account has children in COA
+        if raw_account_name in coa_parents:
+            parent_account_stack = [raw_account_name]  # Reset to this as the new parent
+        elif not parent_account_stack or not coa_has_prefix(parent_account_stack[0] + ":" + raw_account_name):
+            parent_account_stack = []  # Clear stack if this isn't a sub-account
+    
+    # Each row belongs to the nearest account header above it (forward fill)
+    last_header = np.maximum.accumulate(np.where(is_header, np.arange(n_rows), -1))
+    is_txn &= last_header >= 0
+    
+    # Normalize every transaction date to YYYY-MM-DD in one batch
+    dates = np.full(n_rows, "", dtype=object)
+    txn_rows = np.flatnonzero(is_txn)
+    date_idx = date_col if date_col and n_cols > date_col else 1
+    dates[txn_rows] = _normalize_dates(values[txn_rows, date_idx], dayfirst)
+    
+    # Amounts for every transaction row, cleaned column-wise
+    amounts = np.zeros(n_rows)
+    amounts[txn_rows] = _transaction_amounts(values[txn_rows], amount_col, debit_col, credit_col)
+    txn_amounts = amounts.tolist()
     
     # Parse accounts and transactions
-    for i, row in df.iterrows():
-        if i <= header_row:
+    for i in np.flatnonzero(is_header | is_txn):
+        if is_header[i]:
+            current_account, current_account_type = header_accounts[i]
+            if current_account not in accounts:
+                accounts[current_account] = AccountSummary(
+                    name=current_account,
+                    account_type=current_account_type,
+                    total=0,
+                    transaction_count=0,
+                    transactions=[]
+                )
             continue
         
-        try:
-            col0 = str(row[0]).strip() if pd.notna(row[0]) else ""
-            col1 = str(row[1]).strip() if pd.notna(row[1]) else ""
-            
-            if col0 == "nan":
-                col0 = ""
-            if col1 == "nan":
-                col1 = ""
-            
-            # Skip completely empty rows
-            if not col0 and not col1:
-                continue
-            
-            # Handle "Total for X" lines - pop parent when we see total
-            if col0.startswith("Total for "):
-                total_name = col0.replace("Total for ", "").replace(" with sub-accounts", "").strip()
-                # Pop matching parent from stack
-                if parent_account_stack and parent_account_stack[-1].lower() == total_name.lower():
-                    parent_account_stack.pop()
-                elif parent_account_stack:
-                    # Try to find and remove the matching parent
-                    for idx, parent in enumerate(reversed(parent_account_stack)):
-                        if parent.lower() == total_name.lower():
-                            parent_account_stack = parent_account_stack[:len(parent_account_stack)-idx-1]
-                            break
-                continue
-            
-            # Check if this is an account header (has value in col0, nothing meaningful in col1)
-            if col0 and (pd.isna(row[1]) or col1 == "" or col1 == "Beginning Balance") and not col0.startswith("Total"):
-                # This is an account name - could be parent or sub-account
-                raw_account_name = col0.strip()
-                
-                # Try to find as "Parent:SubAccount" first
-                full_account_name = raw_account_name
-                if parent_account_stack:
-                    # Try with parent prefix
-                    for depth in range(len(parent_account_stack), 0, -1):
-                        parent_path = ":".join(parent_account_stack[:depth])
-                        test_name = f"{parent_path}:{raw_account_name}"
-                        if test_name in account_map:
-                            full_account_name = test_name
-                            break
-                
-                current_account = full_account_name
-                # Look up type using smart matching (handles bilingual names)
-                current_account_type = lookup_account_type(current_account)
-                
-                # Try additional matching if still unknown
-                if current_account_type == AccountType.UNKNOWN:
-                    # Try stripping account number prefix (e.g., "1000 Rent" -> "Rent")
-                    import re
-                    stripped_name = re.sub(r'^\d+[\s\-]+', '', current_account).strip()
-                    if stripped_name and stripped_name != current_account:
-                        current_account_type = lookup_account_type(stripped_name)
-                
-                if current_account not in accounts:
-                    accounts[current_account] = AccountSummary(
-                        name=current_account,
-                        account_type=current_account_type,
-                        total=0,
-                        transaction_count=0,
-                        transactions=[]
-                    )
-                
-                # Track as potential parent (might have sub-accounts)
-                # Check if this account has children in COA
-                has_children = any(name.startswith(raw_account_name + ":") for name in account_map.keys())
-                if has_children:
-                    parent_account_stack = [raw_account_name]  # Reset to this as the new parent
-                elif not parent_account_stack or not any(name.startswith(parent_account_stack[0] + ":" + raw_account_name) for name in account_map.keys()):
-                    parent_account_stack = []  # Clear stack if this isn't a sub-account
-            
-            # Skip "Total" lines - already handled above for popping parent stack
-            elif col0.startswith("Total "):
-                continue
+        current_account, current_account_type = header_accounts[last_header[i]]
+        
+        date = dates[i]
+        vendor = vendor_text[i] if vendor_text is not None else ""
+        description = desc_text[i] if desc_text is not None else ""
+        
+        amount = txn_amounts[i]
+        
+        if date and date != "nan":
+            txn = Transaction(
+                date=date,
+                account=current_account,
+                account_type=current_account_type,
+                description=description,
+                amount=amount,
+                vendor=vendor
+            )
+            all_transactions.append(txn)
+            accounts[current_account].transactions.append(txn)
             
-            # Otherwise it might be a transaction row
-            elif current_account and col1 and col1 != "nan" and col1 != "Beginning Balance":
-                # Get date from detected column
-                date_val = row[date_col] if date_col and len(row) > date_col else row[1]
-                date = ""
-                if pd.notna(date_val):
-                    # Always normalize to YYYY-MM-DD format
-                    try:
-                        if hasattr(date_val, 'strftime'):
-                            date = date_val.strftime('%Y-%m-%d')
-                        else:
-                            # Parse string dates with pandas and normalize
-                            # Use detected dayfirst setting
-                            parsed = pd.to_datetime(date_val, dayfirst=dayfirst)
-                            date = parsed.strftime('%Y-%m-%d')
-                    except:
-                        # Fallback: keep original string
-                        date = str(date_val).strip()
-                
-                # Get vendor
-                vendor = ""
-                if vendor_col and len(row) > vendor_col and pd.notna(row[vendor_col]):
-                    vendor = str(row[vendor_col]).strip()
-                    if vendor == "nan":
-                        vendor = ""
-                
-                # Get description
-                description = ""
-                if desc_col and len(row) > desc_col and pd.notna(row[desc_col]):
-                    description = str(row[desc_col]).strip()
-                    if description == "nan":
-                        description = ""
-                
-                # Get amount - try multiple strategies
-                amount = 0
-                try:
-                    # Strategy 1: Use detected amount column
-                    if amount_col and len(row) > amount_col and pd.notna(row[amount_col]):
-                        val = row[amount_col]
-                        if isinstance(val, str):
-                            val = val.replace(',', '').replace('$', '').replace('(', '-').replace(')', '')
-                        amount = float(val)
-                    # Strategy 2: Use debit/credit columns
-                    elif debit_col is not None or credit_col is not None:
-                        debit = 0
-                        credit = 0
-                        if debit_col and len(row) > debit_col and pd.notna(row[debit_col]):
-                            val = row[debit_col]
-                            if isinstance(val, str):
-                                val = val.replace(',', '').replace('$', '')
-                            debit = float(val) if val else 0
-                        if credit_col and len(row) > credit_col and pd.notna(row[credit_col]):
-                            val = row[credit_col]
-                            if isinstance(val, str):
-                                val = val.replace(',', '').replace('$', '')
-                            credit = float(val) if val else 0
-                        amount = debit - credit
-                    # Strategy 3: Search last few columns for a number
-                    else:
-                        for col_idx in range(len(row) - 1, max(0, len(row) - 4), -1):
-                            if pd.notna(row[col_idx]):
-                                try:
-                                    val = row[col_idx]
-                                    if isinstance(val, str):
-                                        val = val.replace(',', '').replace('$', '').replace('(', '-').replace(')', '')
-                                    test_amount = float(val)
-                                    if test_amount != 0:
-                                        amount = test_amount
-                                        break
-                                except:
-                                    pass
-                except:
-                    pass
-                
-                if date and date != "nan":
-                    txn = Transaction(
+            # Also track the SPLIT account (this is where P&L accounts often appear)
+            if split_text is not None:
+                split_account = split_text[i]
+                if split_account and split_account != "-Split-":
+                    # Look up split account type
+                    split_account_type = lookup_account_type(split_account)
+                    
+                    # Create split account entry if doesn't exist
+                    if split_account not in accounts:
+                        accounts[split_account] = AccountSummary(
+                            name=split_account,
+                            account_type=split_account_type,
+                            total=0,
+                            transaction_count=0,
+                            transactions=[]
+                        )
+                    
+                    # Transaction for split account (opposite sign for double-entry)
+                    split_txn = Transaction(
                         date=date,
-                        account=current_account,
-                        account_type=current_account_type,
+                        account=split_account,
+                        account_type=split_account_type,
                         description=description,
-                        amount=amount,
+                        amount=-amount,
                         vendor=vendor
                     )
-                    all_transactions.append(txn)
-                    
-                    if current_account in accounts:
-                        accounts[current_account].transactions.append(txn)
-                        accounts[current_account].transaction_count += 1
-                    
-                    # Also track the SPLIT account (this is where P&L accounts often appear)
-                    if split_col and len(row) > split_col and pd.notna(row[split_col]):
-                        split_account = str(row[split_col]).strip()
-                        if split_account and split_account != "nan" and split_account != "-Split-":
-                            # Look up split account type
-                            split_account_type = lookup_account_type(split_account)
-                            
-                            # Create split account entry if doesn't exist
-                            if split_account not in accounts:
-                                accounts[split_account] = AccountSummary(
-                                    name=split_account,
-                                    account_type=split_account_type,
-                                    total=0,
-                                    transaction_count=0,
-                                    transactions=[]
-                                )
-                            
-                            # Create transaction for split account (opposite sign for double-entry)
-                            split_txn = Transaction(
-                                date=date,
-                                account=split_account,
-                                account_type=split_account_type,
-                                description=description,
-                                amount=-amount,  # Opposite sign
-                                vendor=vendor
-                            )
-                            accounts[split_account].transactions.append(split_txn)
-                            accounts[split_account].transaction_count += 1
-                            all_transactions.append(split_txn)
-        except Exception as e:
-            # Skip malformed rows but continue processing
-            continue
+                    accounts[split_account].transactions.append(split_txn)
+                    all_transactions.append(split_txn)
     
-    # Calculate totals from transactions (not from "Total for" lines)
-    for account_name, account in accounts.items():
+    # Counts and totals from transactions (not from "Total for" lines)
+    for account in accounts.values():
+        account.transaction_count = len(account.transactions)
         account.total = sum(txn.amount for txn in account.transactions)
     
     return accounts, all_transactions
 
 
+# AccountType -> (statement, section) for build_financial_statements
+# (qbo_parser builds its statements from the same table)
+STATEMENT_SECTIONS = {
+    AccountType.REVENUE: ("pnl", "Revenue"),
+    AccountType.COGS: ("pnl", "Cost of Goods Sold"),
+    AccountType.EXPENSE: ("pnl", "Expenses"),
+    AccountType.OTHER_INCOME: ("pnl", "Other Income"),
+    AccountType.OTHER_EXPENSE: ("pnl", "Other Expense"),
+    AccountType.ASSET: ("balance_sheet", "Assets"),
+    AccountType.LIABILITY: ("balance_sheet", "Liabilities"),
+    AccountType.EQUITY: ("balance_sheet", "Equity"),
+}
+
+
 def build_financial_statements(accounts: Dict[str, AccountSummary]) -> Tuple[Dict, Dict]:
     """Build P&L and Balance Sheet from account summaries"""
     
@@ -435,27 +697,21 @@ def build_financial_statements(accounts: Dict[str, AccountSummary]) -> Tuple[Dic
         "Equity": {}
     }
     
+    # One hash lookup per account instead of an if/elif chain
+    statements = {"pnl": pnl, "balance_sheet": balance_sheet}
+    sections = {
+        account_type: statements[statement][section]
+        for account_type, (statement, section) in STATEMENT_SECTIONS.items()
+    }
+    
     for name, account in accounts.items():
         # Skip summary/parent accounts
         if "with sub-accounts" in name:
             continue
-            
-        if account.account_type == AccountType.REVENUE:
-            pnl["Revenue"][name] = account.total
-        elif account.account_type == AccountType.COGS:
-            pnl["Cost of Goods Sold"][name] = account.total
-        elif account.account_type == AccountType.EXPENSE:
-            pnl["Expenses"][name] = account.total
-        elif account.account_type == AccountType.OTHER_INCOME:
-            pnl["Other Income"][name] = account.total
-        elif account.account_type == AccountType.OTHER_EXPENSE:
-            pnl["Other Expense"][name] = account.total
-        elif account.account_type == AccountType.ASSET:
-            balance_sheet["Assets"][name] = account.total
-        elif account.account_type == AccountType.LIABILITY:
-            balance_sheet["Liabilities"][name] = account.total
-        elif account.account_type == AccountType.EQUITY:
-            balance_sheet["Equity"][name] = account.total
+        
+        section = sections.get(account.account_type)
+        if section is not None:
+            section[name] = account.total
     
     return pnl, balance_sheet
 
@@ -463,11 +719,11 @@ def build_financial_statements(accounts: Dict[str, AccountSummary]) -> Tuple[Dic
 def calculate_metrics(pnl: dict) -> dict:
     """Calculate key financial metrics"""
     
-    total_revenue = sum(abs(v) for v in pnl["Revenue"].values())
-    total_cogs = sum(abs(v) for v in pnl["Cost of Goods Sold"].values())
-    total_expenses = sum(abs(v) for v in pnl["Expenses"].values())
-    total_other_income = sum(abs(v) for v in pnl["Other Income"].values())
-    total_other_expense = sum(abs(v) for v in pnl["Other Expense"].values())
+    total_revenue = sum(map(abs, pnl["Revenue"].values()))
+    total_cogs = sum(map(abs, pnl["Cost of Goods Sold"].values()))
+    total_expenses = sum(map(abs, pnl["Expenses"].values()))
+    total_other_income = sum(map(abs, pnl["Other Income"].values()))
+    total_other_expense = sum(map(abs, pnl["Other Expense"].values()))
     
     gross_profit = total_revenue - total_cogs
     gross_margin = (gross_profit / total_revenue * 100) if total_revenue else 0
@@ -497,26 +753,28 @@ def calculate_metrics(pnl: dict) -> dict:
 def find_unusual_transactions(transactions: List[Transaction], threshold_multiplier: float = 3.0) -> List[Transaction]:
     """Find transactions that are unusually large compared to average"""
     
-    # Group by account
-    by_account = {}
-    for txn in transactions:
-        if txn.account not in by_account:
-            by_account[txn.account] = []
-        by_account[txn.account].append(txn)
+    if not transactions:
+        return []
     
-    unusual = []
-    for account, txns in by_account.items():
-        if len(txns) < 3:
-            continue
-        
-        amounts = [abs(t.amount) for t in txns]
-        avg = sum(amounts) / len(amounts)
-        
-        for txn in txns:
-            if abs(txn.amount) > avg * threshold_multiplier and abs(txn.amount) > 500:
-                unusual.append(txn)
+    # Encode accounts as integer codes and sort so each account is a contiguous
+    # run; stable sort keeps transaction order within an account
+    table = TransactionTable.from_transactions(transactions)
+    codes, _ = table.account_codes
+    amounts = np.abs(table.amount)
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    sorted_amounts = amounts[order]
+    
+    # Per-account mean in one reduction over the runs
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_codes)) + 1]
+    counts = np.diff(np.r_[starts, len(sorted_codes)])
+    means = np.add.reduceat(sorted_amounts, starts) / counts
+    
+    thresholds = np.maximum(means * threshold_multiplier, 500)
+    run_ids = np.repeat(np.arange(len(starts)), counts)
+    mask = (counts[run_ids] >= 3) & (sorted_amounts > thresholds[run_ids])
     
-    return unusual
+    return [transactions[i] for i in order[mask]]
 
 
 def format_currency(amount: float) -> str:
@@ -547,7 +805,8 @@ def generate_report(gl_file: str, mapping_file: str, api_key: str = None, valida
     # Run validation to ensure parsing accuracy
     validation_result = None
     if validate:
-        from validation import validate_gl_parsing, generate_validation_report
+        # Imported here: validation imports gl_analyzer in turn
+        from validation import validate_gl_parsing
         validation_result = validate_gl_parsing(gl_file, accounts, account_map)
     
     # Build report
@@ -9,6 +9,26 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 import re
+import csv
+import io
+
+
+# Characters stripped from currency cells: symbols, thousands separators, spaces
+_CURRENCY_TABLE = str.maketrans('', '', '$€£¥, ')
+
+
+# Month-name detection: abbreviations in the date-range line, full names
+# (or "total") in the column-header row
+_MONTH_ABBR_RE = re.compile(r'jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec', re.I)
+_MONTH_HEADER_RE = re.compile(
+    r'january|february|march|april|may|june|july|august|september|october|november|december|total', re.I
+)
+
+# Cells read_csv would treat as missing (its default na_values)
+_NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
 
 
 class PLSection(Enum):
@@ -24,7 +44,19 @@ class PLSection(Enum):
     UNKNOWN = "Unknown"
 
 
-@dataclass
+# PLStatement total fields, in the order of get_summary_dict's "totals"
+_TOTAL_FIELDS = (
+    "total_income", "total_cogs", "gross_profit", "total_expenses",
+    "net_operating_income", "total_other_income", "total_other_expense", "net_income"
+)
+# ...and the matching get_summary_dict keys
+_SUMMARY_KEYS = (
+    "revenue", "cogs", "gross_profit", "expenses",
+    "operating_income", "other_income", "other_expense", "net_income"
+)
+
+
+@dataclass(slots=True)
 class PLLineItem:
     """A single line item from the P&L"""
     name: str
@@ -36,7 +68,7 @@ class PLLineItem:
     indent_level: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class PLStatement:
     """Parsed P&L statement with monthly data"""
     company_name: str
@@ -67,12 +99,11 @@ def parse_currency(value: str) -> float:
     if val_str in ["", "-", "–", "—"]:
         return 0.0
     
-    # Remove currency symbols and whitespace
-    val_str = re.sub(r'[$€£¥]', '', val_str)
-    val_str = val_str.replace(',', '').replace(' ', '')
+    # Remove currency symbols, commas and spaces in one pass
+    val_str = val_str.translate(_CURRENCY_TABLE)
     
-    # Handle parentheses for negative numbers
-    if val_str.startswith('(') and val_str.endswith(')'):
+    # Handle parentheses for negative numbers: "(12.50)" -> "-12.50"
+    if val_str[:1] == '(' and val_str[-1:] == ')':
         val_str = '-' + val_str[1:-1]
     
     try:
@@ -81,31 +112,141 @@ def parse_currency(value: str) -> float:
         return 0.0
 
 
-def detect_section(row_name: str, current_section: PLSection) -> PLSection:
-    """Detect which P&L section a row belongs to"""
-    name_lower = row_name.lower().strip()
-    
-    # Section headers
-    if name_lower == "income" or name_lower == "revenue":
-        return PLSection.INCOME
-    elif name_lower in ["cost of goods sold", "cost of sales", "cogs"]:
-        return PLSection.COGS
-    elif name_lower == "gross profit":
-        return PLSection.GROSS_PROFIT
-    elif name_lower == "expenses" or name_lower == "operating expenses":
-        return PLSection.EXPENSES
-    elif name_lower in ["net operating income", "operating income"]:
-        return PLSection.NET_OPERATING_INCOME
-    elif name_lower == "other income":
-        return PLSection.OTHER_INCOME
-    elif name_lower in ["other expense", "other expenses", "other costs"]:
-        return PLSection.OTHER_EXPENSE
-    elif name_lower in ["net other income", "total other income/expense"]:
-        return PLSection.NET_OTHER_INCOME
-    elif name_lower in ["net income", "profit", "net profit"]:
-        return PLSection.NET_INCOME
-    
-    return current_section
+def parse_currency_array(values) -> np.ndarray:
+    """
+    parse_currency over a whole block of cells at once (same result per cell).
+
+    Text is cleaned with vectorized string ops and converted in bulk; only
+    cells that still don't convert go through the scalar parser.
+    """
+    cells = np.asarray(values, dtype=object)
+    flat = cells.ravel()
+    result = np.zeros(len(flat))
+    
+    missing = pd.isna(flat)
+    is_text = np.array([isinstance(v, str) for v in flat], dtype=bool)
+    is_number = np.array(
+        [isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_)) for v in flat],
+        dtype=bool
+    ) & ~missing
+    result[is_number] = flat[is_number].astype(np.float64)
+    
+    if is_text.any():
+        raw = pd.Series(flat[is_text], dtype=object)
+        text = raw.str.strip()
+        blank = (raw == "nan") | text.isin(["", "-", "–", "—"])
+        text = text.str.translate(_CURRENCY_TABLE)
+        negative = text.str.startswith('(') & text.str.endswith(')')
+        text[negative] = '-' + text[negative].str[1:-1]
+        converts = pd.to_numeric(text, errors='coerce').notna() & ~blank
+        
+        text_values = np.zeros(len(text))
+        # astype(float) matches float() exactly; to_numeric only picks the cells
+        try:
+            text_values[converts.to_numpy()] = text[converts].to_numpy(dtype=object).astype(np.float64)
+        except ValueError:
+            # to_numeric takes a few spellings float() rejects; leave the
+            # text to the scalar parser
+            converts[:] = False
+        result[is_text] = text_values
+        
+        leftover = np.flatnonzero(is_text)[(~converts & ~blank).to_numpy()]
+    else:
+        leftover = np.empty(0, dtype=np.intp)
+    
+    # Anything else (odd spellings, non-numeric objects) takes the scalar path
+    other = ~missing & ~is_text & ~is_number
+    for k in np.concatenate([leftover, np.flatnonzero(other)]):
+        result[k] = parse_currency(flat[k])
+    
+    return result.reshape(cells.shape)
+
+
+# Section header row text (lowercased) -> section it starts
+_SECTION_HEADERS = {
+    "income": PLSection.INCOME,
+    "revenue": PLSection.INCOME,
+    "cost of goods sold": PLSection.COGS,
+    "cost of sales": PLSection.COGS,
+    "cogs": PLSection.COGS,
+    "gross profit": PLSection.GROSS_PROFIT,
+    "expenses": PLSection.EXPENSES,
+    "operating expenses": PLSection.EXPENSES,
+    "net operating income": PLSection.NET_OPERATING_INCOME,
+    "operating income": PLSection.NET_OPERATING_INCOME,
+    "other income": PLSection.OTHER_INCOME,
+    "other expense": PLSection.OTHER_EXPENSE,
+    "other expenses": PLSection.OTHER_EXPENSE,
+    "other costs": PLSection.OTHER_EXPENSE,
+    "net other income": PLSection.NET_OTHER_INCOME,
+    "total other income/expense": PLSection.NET_OTHER_INCOME,
+    "net income": PLSection.NET_INCOME,
+    "profit": PLSection.NET_INCOME,
+    "net profit": PLSection.NET_INCOME,
+}
+
+# QBO's own total/summary rows (lowercased) -> PLStatement field they fill.
+# "net other income" is recognised but not stored.
+_QBO_TOTAL_ROWS = {
+    "gross profit": "gross_profit",
+    "net operating income": "net_operating_income",
+    "operating income": "net_operating_income",
+    "net other income": None,
+    "net income": "net_income",
+    "profit": "net_income",
+    "net profit": "net_income",
+    "total for income": "total_income",
+    "total income": "total_income",
+    "total revenue": "total_income",
+    "total for cost of goods sold": "total_cogs",
+    "total cost of goods sold": "total_cogs",
+    "total cogs": "total_cogs",
+    "total for expenses": "total_expenses",
+    "total expenses": "total_expenses",
+    "total operating expenses": "total_expenses",
+    "total for other income": "total_other_income",
+    "total other income": "total_other_income",
+    "total for other expense": "total_other_expense",
+    "total other expense": "total_other_expense",
+    "total other expenses": "total_other_expense",
+    "total for other expenses": "total_other_expense",
+}
+
+
+def detect_section(row_name: str, current_section: PLSection, name_lower: Optional[str] = None) -> PLSection:
+    """Detect which P&L section a row belongs to (pass name_lower if already computed)"""
+    if name_lower is None:
+        name_lower = row_name.lower().strip()
+    return _SECTION_HEADERS.get(name_lower, current_section)
+
+
+def _read_pl_rows(file_path) -> np.ndarray:
+    """
+    Read the raw report with csv.reader into an object array (None = blank).
+
+    The P&L export is a ragged text report, so there's nothing for pandas'
+    type inference to do; short rows are padded and blank lines skipped.
+    file_path may also be an open file (text or binary), like read_csv takes.
+    """
+    if hasattr(file_path, 'read'):
+        text = file_path.read()
+        if isinstance(text, bytes):
+            text = text.decode('utf-8-sig')
+        lines = io.StringIO(text.lstrip('\ufeff'), newline='')
+    else:
+        lines = open(file_path, newline='', encoding='utf-8-sig')
+    with lines as f:
+        rows = [
+            [None if cell in _NA_STRINGS else cell for cell in row]
+            for row in csv.reader(f)
+            if row and not (len(row) == 1 and not row[0].strip())
+        ]
+    
+    width = max((len(row) for row in rows), default=0)
+    values = np.empty((len(rows), width), dtype=object)
+    for i, row in enumerate(rows):
+        values[i, :len(row)] = row
+    return values
 
 
 def parse_pl_csv(file_path: str) -> PLStatement:
@@ -122,29 +263,33 @@ def parse_pl_csv(file_path: str) -> PLStatement:
     
     Returns: PLStatement with all parsed data
     """
-    # Read raw CSV
-    df = pd.read_csv(file_path, header=None)
+    # Read raw CSV as a plain object array plus a missing-cell mask
+    values = _read_pl_rows(file_path)
+    missing = pd.isna(values)
+    n_rows, n_cols = values.shape
+    first_col = [str(v) if not m else "" for v, m in zip(values[:, 0], missing[:, 0])]
     
     # Extract header info
     company_name = ""
     date_range = ""
     header_row = 0
     
-    for i, row in df.iterrows():
-        row_str = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ""
+    for i in range(n_rows):
+        row_str = first_col[i].strip()
+        row_lower = row_str.lower()
         
-        if row_str.lower() == "profit and loss":
+        if row_lower == "profit and loss":
             continue
-        elif company_name == "" and row_str and "january" not in row_str.lower() and "distribution" not in row_str.lower():
+        elif company_name == "" and row_str and "january" not in row_lower and "distribution" not in row_lower:
             company_name = row_str
-        elif "january" in row_str.lower() or "-" in row_str and any(m in row_str.lower() for m in ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]):
+        elif "january" in row_lower or "-" in row_str and _MONTH_ABBR_RE.search(row_str):
             date_range = row_str
-        elif "distribution" in row_str.lower() or "account" in row_str.lower() or row_str == "":
+        elif "distribution" in row_lower or "account" in row_lower or row_str == "":
             # Check if next cells are month names
             has_months = False
-            for j in range(1, min(5, len(row))):
-                cell = str(row.iloc[j]).strip().lower() if pd.notna(row.iloc[j]) else ""
-                if any(m in cell for m in ["january", "february", "march", "april", "may", "june", "july", "august", "september", "october", "november", "december", "total"]):
+            for j in range(1, min(5, n_cols)):
+                cell = str(values[i, j]).strip().lower() if not missing[i, j] else ""
+                if _MONTH_HEADER_RE.search(cell):
                     has_months = True
                     break
             if has_months:
@@ -152,137 +297,110 @@ def parse_pl_csv(file_path: str) -> PLStatement:
                 break
     
     # Get column headers (months)
-    header = df.iloc[header_row]
     months = []
-    for j in range(1, len(header)):
-        val = str(header.iloc[j]).strip() if pd.notna(header.iloc[j]) else ""
+    for j in range(1, n_cols):
+        val = str(values[header_row, j]).strip() if not missing[header_row, j] else ""
         if val and val.lower() != "nan":
             months.append(val)
     
-    # Parse data rows
-    line_items = []
+    # Parse data rows; line items are built once their amounts are parsed
+    line_item_fields = []  # (name, section, parent, is_total_row, indent_level)
+    item_rows = []  # source row behind each line item
     current_section = PLSection.UNKNOWN
     parent_stack = []  # Track parent accounts for indentation
     
-    # Temp storage for QBO calculated values (captured during parsing, assigned after statement creation)
-    qbo_total_income = {}
-    qbo_total_cogs = {}
-    qbo_total_expenses = {}
-    qbo_gross_profit = {}
-    qbo_net_operating_income = {}
-    qbo_total_other_income = {}
-    qbo_total_other_expense = {}
-    qbo_net_income = {}
-    
-    for i in range(header_row + 1, len(df)):
-        row = df.iloc[i]
+    # Temp storage for QBO calculated values (captured during parsing, assigned
+    # after statement creation): PLStatement field -> source row
+    qbo_total_rows = {}
+    
+    for i in range(header_row + 1, n_rows):
+        row = values[i]
         
         # Get account name
-        account_name = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ""
+        original_name = first_col[i]
+        account_name = original_name.strip()
         if not account_name or account_name == "nan":
             continue
+        name_lower = account_name.lower()
         
         # Detect section changes
-        new_section = detect_section(account_name, current_section)
+        new_section = detect_section(account_name, current_section, name_lower)
         if new_section != current_section:
             current_section = new_section
             # Skip section header rows (they have no values)
             has_values = False
-            for j in range(1, min(len(row), len(months) + 2)):
-                if pd.notna(row.iloc[j]) and str(row.iloc[j]).strip() not in ["", "nan"]:
+            for j in range(1, min(n_cols, len(months) + 2)):
+                if not missing[i, j] and str(row[j]).strip() not in ["", "nan"]:
                     has_values = True
                     break
             if not has_values:
                 continue
         
         # Skip footer/metadata rows
-        if "accrual basis" in account_name.lower() or "cash basis" in account_name.lower():
+        if "accrual basis" in name_lower or "cash basis" in name_lower:
             continue
         
         # Capture QBO's calculated rows as source of truth (don't add as line items)
-        name_lower = account_name.lower()
-        
         # Check for QBO total/summary rows
-        is_qbo_total = name_lower in [
-            "gross profit", "net operating income", "operating income", "net other income", 
-            "net income", "profit", "net profit",
-            "total for income", "total income", "total revenue",
-            "total for cost of goods sold", "total cost of goods sold", "total cogs",
-            "total for expenses", "total expenses", "total operating expenses",
-            "total for other income", "total other income",
-            "total for other expense", "total other expense", "total other expenses", "total for other expenses"
-        ]
-        
-        if is_qbo_total:
-            monthly_values = {}
-            for j, month in enumerate(months):
-                if j + 1 < len(row):
-                    monthly_values[month] = parse_currency(row.iloc[j + 1])
-            
-            # Store QBO's values in temp variables (assigned to statement after creation)
-            if name_lower == "gross profit":
-                qbo_gross_profit = monthly_values
-            elif name_lower in ["net operating income", "operating income"]:
-                qbo_net_operating_income = monthly_values
-            elif name_lower in ["net income", "profit", "net profit"]:
-                qbo_net_income = monthly_values
-            elif name_lower in ["total for income", "total income", "total revenue"]:
-                qbo_total_income = monthly_values
-            elif name_lower in ["total for cost of goods sold", "total cost of goods sold", "total cogs"]:
-                qbo_total_cogs = monthly_values
-            elif name_lower in ["total for expenses", "total expenses", "total operating expenses"]:
-                qbo_total_expenses = monthly_values
-            elif name_lower in ["total for other income", "total other income"]:
-                qbo_total_other_income = monthly_values
-            elif name_lower in ["total for other expense", "total other expense", "total other expenses", "total for other expenses"]:
-                qbo_total_other_expense = monthly_values
+        if name_lower in _QBO_TOTAL_ROWS:
+            field_name = _QBO_TOTAL_ROWS[name_lower]
+            if field_name:
+                qbo_total_rows[field_name] = i
             continue
         
-        # Parse monthly values
-        monthly_values = {}
-        for j, month in enumerate(months):
-            if j + 1 < len(row):
-                monthly_values[month] = parse_currency(row.iloc[j + 1])
-        
         # Detect if this is a total row
-        is_total = account_name.lower().startswith("total for ") or account_name.lower().startswith("total ")
+        is_total = name_lower.startswith(("total for ", "total "))
         
         # Detect indent level (number of leading spaces or tabs, or account number prefix)
         indent_level = 0
-        original_name = str(row.iloc[0]) if pd.notna(row.iloc[0]) else ""
         leading_spaces = len(original_name) - len(original_name.lstrip())
         if leading_spaces > 0:
             indent_level = leading_spaces // 2  # Assume 2 spaces per indent
         
+        # Drop stack entries at the same or higher indent (the stack's indents
+        # strictly increase, so they are all at the end). Total rows leave it as is.
+        if not is_total:
+            while parent_stack and parent_stack[-1][1] >= indent_level:
+                parent_stack.pop()
+        
         # Determine parent account
         parent = None
         if indent_level > 0 and parent_stack:
-            # Find parent at lower indent level
+            # Find parent at lower indent level (the top entry, unless this is a total row)
             for p_name, p_indent in reversed(parent_stack):
                 if p_indent < indent_level:
                     parent = p_name
                     break
         
-        # Update parent stack
         if not is_total:
-            # Remove items at same or higher indent
-            parent_stack = [(n, i) for n, i in parent_stack if i < indent_level]
             parent_stack.append((account_name, indent_level))
         
-        # Get total from last column (usually "Total")
-        total_val = monthly_values.get(months[-1], 0) if months else 0
-        
-        # Create line item
-        item = PLLineItem(
-            name=account_name,
-            section=current_section,
+        line_item_fields.append((account_name, current_section, parent, is_total, indent_level))
+        item_rows.append(i)
+    
+    # Monthly cells of the line items and QBO total rows only, parsed in one
+    # go; skipped header/footer rows are never converted
+    totals_rows = list(qbo_total_rows.values())
+    amounts = parse_currency_array(values[np.asarray(item_rows + totals_rows, dtype=np.intp), 1:len(months) + 1])
+    
+    # Each line item's total comes from the last column (usually "Total")
+    line_items = [
+        PLLineItem(
+            name=name,
+            section=section,
             parent=parent,
-            monthly_values=monthly_values,
-            total=total_val,
+            monthly_values=dict(zip(months, row)),
+            total=row[-1] if months else 0,
             is_total_row=is_total,
             indent_level=indent_level
         )
-        line_items.append(item)
+        for (name, section, parent, is_total, indent_level), row in zip(line_item_fields, amounts[:len(item_rows)].tolist())
+    ]
+    
+    qbo_totals = {
+        field_name: dict(zip(months, row.tolist()))
+        for field_name, row in zip(qbo_total_rows, amounts[len(item_rows):])
+    }
     
     # Build the statement
     statement = PLStatement(
@@ -293,22 +411,9 @@ def parse_pl_csv(file_path: str) -> PLStatement:
     )
     
     # Assign QBO's values (source of truth from the P&L report)
-    if qbo_total_income:
-        statement.total_income = qbo_total_income
-    if qbo_total_cogs:
-        statement.total_cogs = qbo_total_cogs
-    if qbo_total_expenses:
-        statement.total_expenses = qbo_total_expenses
-    if qbo_total_other_income:
-        statement.total_other_income = qbo_total_other_income
-    if qbo_total_other_expense:
-        statement.total_other_expense = qbo_total_other_expense
-    if qbo_gross_profit:
-        statement.gross_profit = qbo_gross_profit
-    if qbo_net_operating_income:
-        statement.net_operating_income = qbo_net_operating_income
-    if qbo_net_income:
-        statement.net_income = qbo_net_income
+    for field_name, monthly_values in qbo_totals.items():
+        if monthly_values:
+            setattr(statement, field_name, monthly_values)
     
     # Calculate section totals (only for values not already set from QBO)
     calculate_section_totals(statement)
@@ -322,6 +427,15 @@ def parse_pl_csv(file_path: str) -> PLStatement:
     return statement
 
 
+def _monthly_matrix(line_items: List[PLLineItem], months: List[str]) -> np.ndarray:
+    """Line items x months float64 matrix read from monthly_values (missing months are 0)"""
+    values = np.zeros((len(line_items), len(months)))
+    for k, item in enumerate(line_items):
+        get = item.monthly_values.get
+        values[k] = [get(m, 0) for m in months]
+    return values
+
+
 def calculate_section_totals(statement: PLStatement) -> None:
     """
     Calculate/validate totals for each P&L section by month.
@@ -340,27 +454,22 @@ def calculate_section_totals(statement: PLStatement) -> None:
     
     # If we don't have QBO totals, calculate from line items
     if not has_qbo_income or not has_qbo_expenses:
-        calculated_income = {m: 0 for m in all_months}
-        calculated_cogs = {m: 0 for m in all_months}
-        calculated_expenses = {m: 0 for m in all_months}
-        calculated_other_income = {m: 0 for m in all_months}
-        calculated_other_expense = {m: 0 for m in all_months}
+        # Sum each section's (non-total) rows of the amounts matrix in one
+        # reduction; months start at 0 so sections without items still list them
+        values = _monthly_matrix(statement.line_items, statement.months)
         
-        for item in statement.line_items:
-            if item.is_total_row:
-                continue
-            
-            for month, value in item.monthly_values.items():
-                if item.section == PLSection.INCOME:
-                    calculated_income[month] = calculated_income.get(month, 0) + value
-                elif item.section == PLSection.COGS:
-                    calculated_cogs[month] = calculated_cogs.get(month, 0) + value
-                elif item.section == PLSection.EXPENSES:
-                    calculated_expenses[month] = calculated_expenses.get(month, 0) + value
-                elif item.section == PLSection.OTHER_INCOME:
-                    calculated_other_income[month] = calculated_other_income.get(month, 0) + value
-                elif item.section == PLSection.OTHER_EXPENSE:
-                    calculated_other_expense[month] = calculated_other_expense.get(month, 0) + value
+        def section_totals(section: PLSection) -> Dict[str, float]:
+            totals = {m: 0 for m in all_months}
+            rows = [k for k, item in enumerate(statement.line_items) if not item.is_total_row and item.section == section]
+            if rows:
+                totals.update(zip(statement.months, values[rows].sum(axis=0).tolist()))
+            return totals
+        
+        calculated_income = section_totals(PLSection.INCOME)
+        calculated_cogs = section_totals(PLSection.COGS)
+        calculated_expenses = section_totals(PLSection.EXPENSES)
+        calculated_other_income = section_totals(PLSection.OTHER_INCOME)
+        calculated_other_expense = section_totals(PLSection.OTHER_EXPENSE)
         
         # Only use calculated values if QBO values aren't set
         if not has_qbo_income:
@@ -390,6 +499,11 @@ def calculate_section_totals(statement: PLStatement) -> None:
             statement.net_income[month] = statement.net_operating_income.get(month, 0) + net_other
 
 
+def _totals_column(statement: PLStatement, key: str) -> np.ndarray:
+    """The eight section totals for one month column, in _TOTAL_FIELDS order"""
+    return np.array([getattr(statement, name).get(key, 0) for name in _TOTAL_FIELDS], dtype=np.float64)
+
+
 def validate_pl_totals(statement: PLStatement) -> list:
     """
     Validate that P&L totals match expected relationships.
@@ -403,14 +517,8 @@ def validate_pl_totals(statement: PLStatement) -> list:
         return errors  # Can't validate without Total column
     
     # Get totals
-    income = statement.total_income.get(total_key, 0)
-    cogs = statement.total_cogs.get(total_key, 0)
-    gross_profit = statement.gross_profit.get(total_key, 0)
-    expenses = statement.total_expenses.get(total_key, 0)
-    net_op_income = statement.net_operating_income.get(total_key, 0)
-    other_income = statement.total_other_income.get(total_key, 0)
-    other_expense = statement.total_other_expense.get(total_key, 0)
-    net_income = statement.net_income.get(total_key, 0)
+    (income, cogs, gross_profit, expenses,
+     net_op_income, other_income, other_expense, net_income) = _totals_column(statement, total_key).tolist()
     
     # Tolerance for rounding (1 cent)
     tol = 0.01
@@ -444,17 +552,17 @@ def get_monthly_dataframe(statement: PLStatement, section: Optional[PLSection] =
     Returns:
         DataFrame with accounts as rows, months as columns
     """
-    data = []
-    
-    for item in statement.line_items:
-        if section and item.section != section:
-            continue
-        
-        row = {"Account": item.name, "Section": item.section.value}
-        for month in statement.months:
-            row[month] = item.monthly_values.get(month, 0)
-        
-        data.append(row)
+    rows = [k for k, item in enumerate(statement.line_items) if not section or item.section == section]
+    if not rows:
+        return pd.DataFrame()
+    
+    # Build by column from the amounts matrix rather than row dicts
+    items = [statement.line_items[k] for k in rows]
+    data = {
+        "Account": [item.name for item in items],
+        "Section": [item.section.value for item in items],
+    }
+    data.update(zip(statement.months, _monthly_matrix(items, statement.months).T))
     
     return pd.DataFrame(data)
 
@@ -466,20 +574,11 @@ def get_summary_dict(statement: PLStatement) -> dict:
     Returns dict matching the format from csv_parser.analyze_csv_files
     """
     # Get the "Total" column or sum all months
-    total_key = "Total" if "Total" in statement.total_income else list(statement.total_income.keys())[-1] if statement.total_income else None
+    total_key = "Total" if "Total" in statement.total_income else next(reversed(statement.total_income), None)
     
     if total_key:
         return {
-            "totals": {
-                "revenue": statement.total_income.get(total_key, 0),
-                "cogs": statement.total_cogs.get(total_key, 0),
-                "gross_profit": statement.gross_profit.get(total_key, 0),
-                "expenses": statement.total_expenses.get(total_key, 0),
-                "operating_income": statement.net_operating_income.get(total_key, 0),
-                "other_income": statement.total_other_income.get(total_key, 0),
-                "other_expense": statement.total_other_expense.get(total_key, 0),
-                "net_income": statement.net_income.get(total_key, 0)
-            },
+            "totals": dict(zip(_SUMMARY_KEYS, _totals_column(statement, total_key).tolist())),
             "monthly": {
                 "income": statement.total_income,
                 "cogs": statement.total_cogs,
@@ -514,47 +613,45 @@ def get_variance_analysis(statement: PLStatement) -> List[dict]:
     # Get month columns (excluding "Total")
     months = [m for m in statement.months if m.lower() != "total"]
     
-    for item in statement.line_items:
-        if item.is_total_row:
-            continue
+    # Month-by-month matrix of the non-total items
+    detail = [k for k, item in enumerate(statement.line_items) if not item.is_total_row]
+    values = _monthly_matrix([statement.line_items[k] for k in detail], months)
+    
+    # All month-over-month changes at once
+    prev = values[:, :-1]
+    changes = np.diff(values, axis=1)
+    has_prev = prev != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_changes = np.where(
+            has_prev,
+            changes / np.abs(prev) * 100,
+            np.where(changes > 0, np.inf, np.where(changes < 0, -np.inf, 0.0))
+        )
+        # Flag significant changes (>50% or large absolute)
+        flagged = has_prev & (np.abs(pct_changes) > 50) & (np.abs(changes) > 500)
+    
+    for r, k in enumerate(detail):
+        item = statement.line_items[k]
+        change_row = changes[r].tolist()
+        pct_row = pct_changes[r].tolist()
         
         record = {
             "account": item.name,
             "section": item.section.value,
             "parent": item.parent,
-            "values": {},
-            "changes": {},
-            "pct_changes": {},
-            "flags": []
+            "values": dict(zip(months, values[r].tolist())),
+            "changes": dict(zip(months[1:], change_row)),
+            "pct_changes": dict(zip(months[1:], pct_row)),
+            "flags": [
+                {
+                    "month": months[j + 1],
+                    "change": change_row[j],
+                    "pct_change": pct_row[j],
+                    "severity": "high" if abs(pct_row[j]) > 100 else "medium"
+                }
+                for j in np.flatnonzero(flagged[r])
+            ]
         }
-        
-        prev_value = None
-        for month in months:
-            value = item.monthly_values.get(month, 0)
-            record["values"][month] = value
-            
-            if prev_value is not None:
-                change = value - prev_value
-                record["changes"][month] = change
-                
-                # Calculate percentage change
-                if prev_value != 0:
-                    pct_change = (change / abs(prev_value)) * 100
-                    record["pct_changes"][month] = pct_change
-                    
-                    # Flag significant changes (>50% or large absolute)
-                    if abs(pct_change) > 50 and abs(change) > 500:
-                        record["flags"].append({
-                            "month": month,
-                            "change": change,
-                            "pct_change": pct_change,
-                            "severity": "high" if abs(pct_change) > 100 else "medium"
-                        })
-                else:
-                    record["pct_changes"][month] = float('inf') if change > 0 else float('-inf') if change < 0 else 0
-            
-            prev_value = value
-        
         variances.append(record)
     
     return variances
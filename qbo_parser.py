@@ -3,10 +3,14 @@ QBO General Ledger Parser
 Parses QuickBooks Online GL exports and builds financial statements
 """
 
+import re
 import pandas as pd
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+
+from gl_analyzer import EXCEL_ENGINE, STATEMENT_SECTIONS
 
 
 class AccountType(Enum):
@@ -21,7 +25,34 @@ class AccountType(Enum):
     UNKNOWN = "Unknown"
 
 
-@dataclass
+# Account-name keywords per type, matched as substrings of the lowercased
+# name (one compiled alternation each, tried in classify_account's order)
+_ASSET_RE = re.compile(
+    r'rbc |scotiabank|paypal|stripe|wix|wealthsimple|inventory|prepaid|'
+    r'accrued revenue|receivable|pocket|clearing'
+)
+_LIABILITY_RE = re.compile(
+    r'payable|visa|mastercard|credit card|hst|gst|tax liabilities|deferred revenue|due to|'
+    r'owing|liability|esdc'
+)
+_EQUITY_RE = re.compile(r'equity|retained|capital|owner')
+_OTHER_INCOME_RE = re.compile(r'interest income|cash back|rebate|canada summer|carbon canada')
+_REVENUE_RE = re.compile(r'sales income|sales|revenue')
+_COGS_RE = re.compile(r'cog |cos |cost of goods|cost of sales|cogs')
+_OTHER_EXPENSE_RE = re.compile(r'penalties|cra interest')
+_EXPENSE_RE = re.compile(
+    r'expense|exp|fees|charges|rent|utilities|insurance|advertising|occupancy|amenities|'
+    r'repairs|maintenance|travel|meals|office|computer|software|telephone|internet|'
+    r'shipping|postage|donations|professional dev|bookkeeping|accounting|gifts|interest expense'
+)
+
+# QBO summary accounts that roll up their children
+_SUMMARY_ACCOUNTS = frozenset([
+    "SALES INCOME", "GENERAL & ADMIN EXP", "OCCUPANCY COSTS", "SALES TAX LIABILITIES"
+])
+
+
+@dataclass(slots=True)
 class Account:
     name: str
     account_type: AccountType
@@ -29,8 +60,9 @@ class Account:
     parent: str = None
 
 
+@lru_cache(maxsize=4096)
 def classify_account(account_name: str) -> AccountType:
-    """Classify an account based on its name"""
+    """Classify an account based on its name (memoised - names repeat across GLs)"""
     name_lower = account_name.lower().strip()
     
     # Skip parent accounts with sub-accounts (avoid double counting)
@@ -38,27 +70,23 @@ def classify_account(account_name: str) -> AccountType:
         return AccountType.UNKNOWN
     
     # Assets - check first to catch bank accounts
-    if any(x in name_lower for x in ['rbc ', 'scotiabank', 'paypal', 'stripe', 
-                                      'wix', 'wealthsimple', 'inventory', 'prepaid', 
-                                      'accrued revenue', 'receivable', 'pocket', 'clearing']):
+    if _ASSET_RE.search(name_lower):
         return AccountType.ASSET
     
     # Liabilities - check before revenue to catch deferred revenue
-    if any(x in name_lower for x in ['payable', 'visa', 'mastercard', 'credit card', 'hst', 
-                                      'gst', 'tax liabilities', 'deferred revenue', 'due to',
-                                      'owing', 'liability', 'esdc']):
+    if _LIABILITY_RE.search(name_lower):
         return AccountType.LIABILITY
     
     # Equity
-    if any(x in name_lower for x in ['equity', 'retained', 'capital', 'owner']):
+    if _EQUITY_RE.search(name_lower):
         return AccountType.EQUITY
     
     # Other Income (check before revenue)
-    if any(x in name_lower for x in ['interest income', 'cash back', 'rebate', 'canada summer', 'carbon canada']):
+    if _OTHER_INCOME_RE.search(name_lower):
         return AccountType.OTHER_INCOME
     
     # Revenue (but not M&E Sales Tax which is an expense recovery)
-    if any(x in name_lower for x in ['sales income', 'sales', 'revenue']) and 'm&e' not in name_lower:
+    if _REVENUE_RE.search(name_lower) and 'm&e' not in name_lower:
         return AccountType.REVENUE
     
     # M&E Sales Tax is an expense
@@ -66,20 +94,15 @@ def classify_account(account_name: str) -> AccountType:
         return AccountType.EXPENSE
     
     # COGS
-    if any(x in name_lower for x in ['cog ', 'cos ', 'cost of goods', 'cost of sales', 'cogs']):
+    if _COGS_RE.search(name_lower):
         return AccountType.COGS
     
     # Other Expense (CRA penalties only - Interest Expense is operating)
-    if any(x in name_lower for x in ['penalties', 'cra interest']):
+    if _OTHER_EXPENSE_RE.search(name_lower):
         return AccountType.OTHER_EXPENSE
     
     # Expenses
-    if any(x in name_lower for x in ['expense', 'exp', 'fees', 'charges', 'rent', 'utilities', 
-                                      'insurance', 'advertising', 'occupancy', 'amenities',
-                                      'repairs', 'maintenance', 'travel', 'meals', 'office',
-                                      'computer', 'software', 'telephone', 'internet', 
-                                      'shipping', 'postage', 'donations', 'professional dev',
-                                      'bookkeeping', 'accounting', 'gifts', 'interest expense']):
+    if _EXPENSE_RE.search(name_lower):
         return AccountType.EXPENSE
     
     return AccountType.UNKNOWN
@@ -87,41 +110,20 @@ def classify_account(account_name: str) -> AccountType:
 
 def parse_qbo_gl(file_path: str) -> Dict[str, Account]:
     """Parse a QBO General Ledger export"""
-    
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    # Same engine as gl_analyzer.read_gl_sheet (calamine when installed)
+    df = pd.read_excel(file_path, sheet_name=0, header=None, engine=EXCEL_ENGINE)
+    values = df.to_numpy(dtype=object)
     
     accounts = {}
     current_account = None
     current_parent = None
     
-    # First pass: collect all account totals
-    all_totals = {}
-    for i, row in df.iterrows():
-        col0 = str(row[0]).strip() if pd.notna(row[0]) else ""
-        if col0.startswith("Total for "):
-            account_name = col0.replace("Total for ", "")
-            balance = row[8] if pd.notna(row[8]) else 0
-            all_totals[account_name] = float(balance) if balance else 0
-    
-    # Identify summary accounts to exclude (roll-ups that would cause double-counting)
-    parent_accounts = set()
-    
-    # These are QBO summary accounts that roll up their children
-    summary_accounts = ["SALES INCOME", "GENERAL & ADMIN EXP", "OCCUPANCY COSTS", 
-                        "SALES TAX LIABILITIES"]
-    
-    for name in all_totals.keys():
-        # "with sub-accounts" entries are always summaries - exclude them
-        if "with sub-accounts" in name:
-            parent_accounts.add(name)
-        # Also exclude known summary parent accounts
-        if name in summary_accounts:
-            parent_accounts.add(name)
-    
-    # Second pass: only include leaf accounts (not parents)
-    for i, row in df.iterrows():
-        col0 = str(row[0]).strip() if pd.notna(row[0]) else ""
-        
+    # Missing-cell mask over the raw values, indexed directly in the loop below
+    missing = pd.isna(values)
+    first_col = ["" if m else str(v).strip() for v, m in zip(values[:, 0], missing[:, 0])] if values.shape[1] else []
+    
+    # Single pass: only include leaf accounts (not parents)
+    for i, col0 in enumerate(first_col):
         # Skip header rows
         if col0 in ["General Ledger", "nan", ""] or "2024" in col0 or "2025" in col0 or "2026" in col0:
             continue
@@ -130,11 +132,13 @@ def parse_qbo_gl(file_path: str) -> Dict[str, Account]:
         if col0.startswith("Total for "):
             account_name = col0.replace("Total for ", "")
             
-            # Skip parent/summary accounts
-            if account_name in parent_accounts:
+            # Skip parent/summary accounts (roll-ups that would cause
+            # double-counting): "with sub-accounts" entries are always
+            # summaries, plus the known QBO summary parents
+            if "with sub-accounts" in account_name or account_name in _SUMMARY_ACCOUNTS:
                 continue
             
-            balance = row[8] if pd.notna(row[8]) else 0
+            balance = values[i, 8] if not missing[i, 8] else 0
             
             if account_name not in accounts:
                 accounts[account_name] = Account(
@@ -145,10 +149,10 @@ def parse_qbo_gl(file_path: str) -> Dict[str, Account]:
                 )
         
         # Check for account header (new account section)
-        elif col0 and not col0.startswith("Total") and pd.isna(row[1]):
+        elif col0 and not col0.startswith("Total") and missing[i, 1]:
             # This is an account name row
             # Check if it's a sub-account (indented with spaces)
-            original = str(row[0]) if pd.notna(row[0]) else ""
+            original = str(values[i, 0]) if not missing[i, 0] else ""
             if original.startswith("   "):
                 current_account = col0
             else:
@@ -175,23 +179,18 @@ def build_financial_statements(accounts: Dict[str, Account]) -> Tuple[Dict, Dict
         "Equity": {}
     }
     
+    # One hash lookup per account instead of an if/elif chain
+    statements = {"pnl": pnl, "balance_sheet": balance_sheet}
+    # The shared table is keyed by coa_parser's AccountType; map by value
+    sections = {
+        AccountType(account_type.value): statements[statement][section]
+        for account_type, (statement, section) in STATEMENT_SECTIONS.items()
+    }
+    
     for name, account in accounts.items():
-        if account.account_type == AccountType.REVENUE:
-            pnl["Revenue"][name] = account.balance
-        elif account.account_type == AccountType.COGS:
-            pnl["Cost of Goods Sold"][name] = account.balance
-        elif account.account_type == AccountType.EXPENSE:
-            pnl["Expenses"][name] = account.balance
-        elif account.account_type == AccountType.OTHER_INCOME:
-            pnl["Other Income"][name] = account.balance
-        elif account.account_type == AccountType.OTHER_EXPENSE:
-            pnl["Other Expense"][name] = account.balance
-        elif account.account_type == AccountType.ASSET:
-            balance_sheet["Assets"][name] = account.balance
-        elif account.account_type == AccountType.LIABILITY:
-            balance_sheet["Liabilities"][name] = account.balance
-        elif account.account_type == AccountType.EQUITY:
-            balance_sheet["Equity"][name] = account.balance
+        section = sections.get(account.account_type)
+        if section is not None:
+            section[name] = account.balance
     
     return pnl, balance_sheet
 
@@ -212,18 +211,16 @@ def print_pnl(pnl: Dict) -> str:
     
     # Revenue
     lines.append("\nREVENUE")
-    total_revenue = 0
     for name, amount in pnl["Revenue"].items():
         lines.append(f"  {name}: {format_currency(abs(amount))}")
-        total_revenue += abs(amount)
+    total_revenue = sum(map(abs, pnl["Revenue"].values()))
     lines.append(f"  TOTAL REVENUE: {format_currency(total_revenue)}")
     
     # COGS
     lines.append("\nCOST OF GOODS SOLD")
-    total_cogs = 0
     for name, amount in pnl["Cost of Goods Sold"].items():
         lines.append(f"  {name}: {format_currency(abs(amount))}")
-        total_cogs += abs(amount)
+    total_cogs = sum(map(abs, pnl["Cost of Goods Sold"].values()))
     lines.append(f"  TOTAL COGS: {format_currency(total_cogs)}")
     
     # Gross Profit
@@ -232,10 +229,9 @@ def print_pnl(pnl: Dict) -> str:
     
     # Expenses
     lines.append("\nOPERATING EXPENSES")
-    total_expenses = 0
     for name, amount in pnl["Expenses"].items():
         lines.append(f"  {name}: {format_currency(abs(amount))}")
-        total_expenses += abs(amount)
+    total_expenses = sum(map(abs, pnl["Expenses"].values()))
     lines.append(f"  TOTAL EXPENSES: {format_currency(total_expenses)}")
     
     # Operating Income
@@ -243,8 +239,8 @@ def print_pnl(pnl: Dict) -> str:
     lines.append(f"\nOPERATING INCOME: {format_currency(operating_income)}")
     
     # Other Income/Expense
-    total_other_income = sum(abs(v) for v in pnl["Other Income"].values())
-    total_other_expense = sum(abs(v) for v in pnl["Other Expense"].values())
+    total_other_income = sum(map(abs, pnl["Other Income"].values()))
+    total_other_expense = sum(map(abs, pnl["Other Expense"].values()))
     
     if total_other_income or total_other_expense:
         lines.append("\nOTHER INCOME/EXPENSE")
@@ -0,0 +1,66 @@
+import datetime
+import json
+import os
+import sys
+
+import pytest
+from openpyxl import Workbook
+
+# The analyzer modules live at the repo root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# A small QBO General Ledger export: a parent with a sub-account, a numbered
+# account, text dates and amounts, splits and a Beginning Balance row
+GL_ROWS = [
+    ["Test Co"],
+    ["General Ledger"],
+    ["January 1 - December 31, 2025"],
+    [],
+    [None, "Date", "Transaction Type", "Num", "Adj", "Name", "Memo/Description", "Split", "Amount", "Balance"],
+    ["Services Income"],
+    ["   Membership Sales"],
+    [None, "Beginning Balance", None, None, None, None, None, None, None, 0],
+    [None, datetime.datetime(2025, 1, 15), "Invoice", "1", None, "Acme", "Jan classes", "RBC Chequing", 1200.0, 1200.0],
+    [None, "02/03/2025", "Invoice", "2", None, "Beta Gym", None, "-Split-", "(1,234.50)", -34.5],
+    [None, datetime.datetime(2025, 3, 20), "Invoice", "3", None, None, "walk-ins", "RBC Chequing", 310.25, 275.75],
+    ["   Total for Membership Sales", None, None, None, None, None, None, None, None, 275.75],
+    ["Total for Services Income with sub-accounts", None, None, None, None, None, None, None, None, 275.75],
+    ["6000 Office Supplies"],
+    [None, datetime.datetime(2025, 3, 1), "Expense", "4", None, "Staples", None, "Visa Card", 89.99, 89.99],
+    [None, datetime.datetime(2025, 3, 9), "Expense", "5", None, "Staples", "  toner  ", None, "$45.00", 134.99],
+    ["Total for 6000 Office Supplies", None, None, None, None, None, None, None, None, 134.99],
+    ["Rent"],
+    [None, datetime.datetime(2025, 1, 1), "Expense", "6", None, "Landlord Inc", "January rent", "RBC Chequing", 2000, 2000],
+    [None, datetime.datetime(2025, 2, 1), "Expense", "7", None, "Landlord Inc", "February rent", "RBC Chequing", 2000, 4000],
+    [None, datetime.datetime(2025, 3, 1), "Expense", "8", None, "Landlord Inc", "March rent", "RBC Chequing", 9000, 13000],
+    ["Total for Rent", None, None, None, None, None, None, None, None, 13000],
+]
+
+ACCOUNT_MAPPING = {
+    "Services Income": "Revenue",
+    "Services Income:Membership Sales": "Revenue",
+    "Office Supplies": "Expense",
+    "Rent": "Expense",
+    "RBC Chequing": "Asset",
+    "Visa Card": "Liability",
+}
+
+
+@pytest.fixture
+def gl_file(tmp_path):
+    path = tmp_path / "gl.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "General Ledger"
+    for row in GL_ROWS:
+        ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def mapping_file(tmp_path):
+    path = tmp_path / "mapping.json"
+    path.write_text(json.dumps(ACCOUNT_MAPPING))
+    return str(path)
@@ -0,0 +1,28 @@
+from expense_analyzer import parse_qbo_gl
+from gl_analyzer import load_account_mapping
+
+
+def test_parse_qbo_gl(gl_file, mapping_file):
+    accounts, transactions = parse_qbo_gl(gl_file, load_account_mapping(mapping_file))
+    
+    # Expected values are what the original row-by-row parser produced: amounts
+    # come straight from the Amount column (text amounts count as 0)
+    assert {name: (a.account_type.value, a.total, a.transaction_count) for name, a in accounts.items()} == {
+        "Services Income": ("Revenue", 0, 0),
+        "Membership Sales": ("Revenue", 1510.25, 3),
+        "6000 Office Supplies": ("Unknown", 89.99, 2),
+        "Rent": ("Expense", 13000.0, 3),
+    }
+    assert [(t.date, t.account, t.account_type.value, t.description, t.amount, t.vendor) for t in transactions] == [
+        ("01/15/2025", "Membership Sales", "Revenue", "Jan classes", 1200.0, "Acme"),
+        ("02/03/2025", "Membership Sales", "Revenue", "", 0.0, "Beta Gym"),
+        ("03/20/2025", "Membership Sales", "Revenue", "walk-ins", 310.25, ""),
+        ("03/01/2025", "6000 Office Supplies", "Unknown", "", 89.99, "Staples"),
+        ("03/09/2025", "6000 Office Supplies", "Unknown", "toner", 0.0, "Staples"),
+        ("01/01/2025", "Rent", "Expense", "January rent", 2000.0, "Landlord Inc"),
+        ("02/01/2025", "Rent", "Expense", "February rent", 2000.0, "Landlord Inc"),
+        ("03/01/2025", "Rent", "Expense", "March rent", 9000.0, "Landlord Inc"),
+    ]
+    
+    for name, account in accounts.items():
+        assert account.transactions == [t for t in transactions if t.account == name]
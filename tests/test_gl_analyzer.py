@@ -0,0 +1,74 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from gl_analyzer import _normalize_date, _normalize_dates, load_account_mapping, parse_gl_with_mapping
+
+
+def test_parse_gl_with_mapping(gl_file, mapping_file):
+    accounts, transactions = parse_gl_with_mapping(gl_file, load_account_mapping(mapping_file))
+    
+    # Expected values are what the original row-by-row parser produced
+    assert {name: (a.account_type.value, a.total, a.transaction_count) for name, a in accounts.items()} == {
+        "Services Income": ("Revenue", 0, 0),
+        "Services Income:Membership Sales": ("Revenue", 275.75, 3),
+        "RBC Chequing": ("Asset", -14510.25, 5),
+        "6000 Office Supplies": ("Expense", 134.99, 2),
+        "Visa Card": ("Liability", -89.99, 1),
+        "Rent": ("Expense", 13000.0, 3),
+    }
+    assert [(t.date, t.account, t.account_type.value, t.description, t.amount, t.vendor) for t in transactions] == [
+        ("2025-01-15", "Services Income:Membership Sales", "Revenue", "Jan classes", 1200.0, "Acme"),
+        ("2025-01-15", "RBC Chequing", "Asset", "Jan classes", -1200.0, "Acme"),
+        ("2025-02-03", "Services Income:Membership Sales", "Revenue", "", -1234.5, "Beta Gym"),
+        ("2025-03-20", "Services Income:Membership Sales", "Revenue", "walk-ins", 310.25, ""),
+        ("2025-03-20", "RBC Chequing", "Asset", "walk-ins", -310.25, ""),
+        ("2025-03-01", "6000 Office Supplies", "Expense", "", 89.99, "Staples"),
+        ("2025-03-01", "Visa Card", "Liability", "", -89.99, "Staples"),
+        ("2025-03-09", "6000 Office Supplies", "Expense", "toner", 45.0, "Staples"),
+        ("2025-01-01", "Rent", "Expense", "January rent", 2000.0, "Landlord Inc"),
+        ("2025-01-01", "RBC Chequing", "Asset", "January rent", -2000.0, "Landlord Inc"),
+        ("2025-02-01", "Rent", "Expense", "February rent", 2000.0, "Landlord Inc"),
+        ("2025-02-01", "RBC Chequing", "Asset", "February rent", -2000.0, "Landlord Inc"),
+        ("2025-03-01", "Rent", "Expense", "March rent", 9000.0, "Landlord Inc"),
+        ("2025-03-01", "RBC Chequing", "Asset", "March rent", -9000.0, "Landlord Inc"),
+    ]
+    
+    # Each account holds its own transactions, in file order
+    for name, account in accounts.items():
+        assert account.transactions == [t for t in transactions if t.account == name]
+
+
+# Month-first layout, ambiguous and unambiguous, ISO and long-form text (the
+# format="mixed" pass), Excel cells incl. time-only and out-of-range years,
+# unparseable text and blanks
+DATE_CELLS = np.array([
+    "03/04/2025", "13/04/2025", " 12/31/2025 ", "2025-01-05", "Jan 7, 2025",
+    "not a date ", None,
+    datetime.datetime(2025, 6, 1), datetime.date(2024, 2, 29), datetime.time(9, 30),
+    datetime.datetime(3025, 5, 6),
+], dtype=object)
+
+
+def test_normalize_dates_month_first():
+    assert _normalize_dates(DATE_CELLS, dayfirst=False).tolist() == [
+        "2025-03-04", "2025-04-13", "2025-12-31", "2025-01-05", "2025-01-07",
+        "not a date", "",
+        "2025-06-01", "2024-02-29", "1900-01-01",
+        "3025-05-06",
+    ]
+
+
+def test_normalize_dates_day_first():
+    dates = _normalize_dates(DATE_CELLS, dayfirst=True).tolist()
+    
+    assert dates[:2] == ["2025-04-03", "2025-04-13"]
+
+
+@pytest.mark.parametrize("dayfirst", [False, True])
+def test_normalize_dates_matches_per_value_parsing(dayfirst):
+    # Mixed time zones make the bulk pass raise, so those go value by value
+    cells = np.append(DATE_CELLS, ["2025-01-01T00:00:00+01:00", "2025-01-02T00:00:00"])
+    
+    assert _normalize_dates(cells, dayfirst).tolist() == [_normalize_date(v, dayfirst) for v in cells]
@@ -0,0 +1,57 @@
+import io
+
+from pl_parser import PLLineItem, PLSection, parse_pl_csv
+
+
+_PL_CSV = (
+    "Profit and Loss\n"
+    "Acme Co\n"
+    '"January - February, 2025"\n'
+    "\n"
+    "Distribution account,January 2025,February 2025,Total\n"
+    "Income,,,\n"
+    'Sales,"1,000.00",(50.00),950.00\n'
+    "Total for Income,1000.00,-50.00,950.00\n"
+    "Expenses,,,\n"
+    "Rent,500.00,500.00,1000.00\n"
+)
+
+
+def test_line_items_with_different_amounts_differ():
+    rent = PLLineItem("Rent", PLSection.EXPENSES, None, {"Jan": 1.0}, 1.0)
+    
+    assert rent == PLLineItem("Rent", PLSection.EXPENSES, None, {"Jan": 1.0}, 1.0)
+    assert rent != PLLineItem("Rent", PLSection.EXPENSES, None, {"Jan": 999.0}, 1.0)
+
+
+def test_parse_pl_csv_monthly_values(tmp_path):
+    path = tmp_path / "pl.csv"
+    path.write_text(_PL_CSV)
+    
+    statement = parse_pl_csv(str(path))
+    
+    items = {item.name: item for item in statement.line_items}
+    assert items["Sales"].monthly_values == {"January 2025": 1000.0, "February 2025": -50.0, "Total": 950.0}
+    assert items["Sales"].total == 950.0
+    assert items["Rent"].section == PLSection.EXPENSES
+    assert statement.total_expenses["Total"] == 1000.0
+
+
+def test_parse_pl_csv_accepts_file_objects(tmp_path):
+    path = tmp_path / "pl.csv"
+    path.write_text(_PL_CSV)
+    
+    from_path = parse_pl_csv(str(path))
+    
+    assert parse_pl_csv(io.StringIO(_PL_CSV)) == from_path
+    assert parse_pl_csv(io.BytesIO(_PL_CSV.encode("utf-8-sig"))) == from_path
+
+
+def test_parse_pl_csv_returns_independent_statements(tmp_path):
+    path = tmp_path / "pl.csv"
+    path.write_text(_PL_CSV)
+    
+    first = parse_pl_csv(str(path))
+    first.line_items[0].monthly_values["Total"] = 0.0
+    
+    assert parse_pl_csv(str(path)).line_items[0].monthly_values["Total"] == 950.0
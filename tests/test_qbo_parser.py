@@ -0,0 +1,70 @@
+import re
+import zipfile
+
+from openpyxl import Workbook
+
+from qbo_parser import parse_qbo_gl
+
+
+def _write_gl(path):
+    wb = Workbook()
+    ws = wb.active
+    rows = [
+        ["General Ledger"],
+        ["January 2025"],
+        [],
+        ["Rent", None],
+        [None, "01/05/2025", "Expense", None, None, None, None, 1000.0, 1000.0],
+        ["Total for Rent", None, None, None, None, None, None, None, 1000.0],
+        ["Sales", None],
+        [None, "01/10/2025", "Invoice", None, None, None, None, 5000.5, 5000.5],
+        ["Total for Sales", None, None, None, None, None, None, None, 5000.5],
+    ]
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def _rewrite_dimension(path, ref):
+    """Rewrite the first sheet's <dimension ref> the way some exporters leave it"""
+    with zipfile.ZipFile(path) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist()}
+    sheet = "xl/worksheets/sheet1.xml"
+    parts[sheet] = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="%s"' % ref.encode(), parts[sheet])
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+
+def _summary(accounts):
+    return {name: (acct.account_type.value, acct.balance) for name, acct in accounts.items()}
+
+
+def test_parse_qbo_gl(tmp_path):
+    path = tmp_path / "gl.xlsx"
+    _write_gl(path)
+    
+    assert _summary(parse_qbo_gl(str(path))) == {
+        "Rent": ("Expense", 1000.0),
+        "Sales": ("Revenue", 5000.5),
+    }
+
+
+def test_parse_qbo_gl_ignores_stale_dimension(tmp_path):
+    path = tmp_path / "gl.xlsx"
+    _write_gl(path)
+    _rewrite_dimension(path, "A1")
+    
+    assert _summary(parse_qbo_gl(str(path))) == {
+        "Rent": ("Expense", 1000.0),
+        "Sales": ("Revenue", 5000.5),
+    }
+
+
+def test_parse_qbo_gl_returns_independent_accounts(tmp_path):
+    path = tmp_path / "gl.xlsx"
+    _write_gl(path)
+    
+    parse_qbo_gl(str(path))["Rent"].balance = 0.0
+    
+    assert parse_qbo_gl(str(path))["Rent"].balance == 1000.0
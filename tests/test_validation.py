@@ -0,0 +1,34 @@
+import numpy as np
+from openpyxl import Workbook
+
+from validation import _parse_total_amount, _parse_total_amounts, extract_gl_totals
+
+
+def test_parse_total_amounts_matches_scalar_parser():
+    cells = np.array(["(1,234.50)", "$3", 12, None, "abc", "1e 5", "1e5"], dtype=object)
+    
+    amounts, parsed = _parse_total_amounts(cells)
+    
+    expected = [_parse_total_amount(v) for v in cells]
+    assert parsed.tolist() == [v is not None for v in expected]
+    assert amounts.tolist() == [0.0 if v is None else v for v in expected]
+
+
+def test_extract_gl_totals_treats_malformed_totals_as_missing(tmp_path):
+    path = tmp_path / "gl.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    for row in [
+        ["General Ledger"],
+        [None, "Date", "Transaction Type", "Amount", "Balance"],
+        ["Rent"],
+        [None, "01/05/2025", "Expense", 1000, 1000],
+        ["Total for Rent", None, None, "1,000.00", "1,000.00"],
+        ["Sales"],
+        [None, "01/10/2025", "Invoice", 500, 500],
+        ["Total for Sales", None, None, "1e 5", "1e 5"],
+    ]:
+        ws.append(row)
+    wb.save(path)
+    
+    assert extract_gl_totals(str(path)) == {"Rent": 1000.0, "Sales": 0}
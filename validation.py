@@ -5,8 +5,19 @@ Ensures parsed output matches source GL totals and all accounts are captured
 
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
+import os
+import re
+import numpy as np
 import pandas as pd
 
+# GL layout helpers shared with the parser; gl_analyzer only imports this
+# module inside generate_report, so importing it here is not circular
+from gl_analyzer import HEADER_DATE_RE, HEADER_GL_RE, TOTAL_FOR_PREFIX, read_gl_sheet
+
+# COA name whose first word contains a digit ("6000 Rent", "A100 Cash")
+_DIGIT_FIRST_WORD_RE = re.compile(r'\s*\S*?\d')
+
 
 @dataclass
 class ValidationResult:
@@ -19,73 +30,178 @@ class ValidationResult:
     summary: str
 
 
+def _parse_total_amount(val) -> Optional[float]:
+    """A GL total cell as a float ("(1,234.50)" -> -1234.5), or None if it isn't one"""
+    if isinstance(val, str):
+        val = val.replace(',', '').replace('$', '').replace('(', '-').replace(')', '')
+    try:
+        return float(val)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _parse_total_amounts(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    _parse_total_amount over a column of cells in bulk.
+
+    Text is cleaned with vectorized string ops and converted at once; cells
+    that still don't convert go through the scalar parser. Returns
+    (amounts, parsed) where parsed marks the cells that converted.
+    """
+    cells = np.asarray(cells, dtype=object)
+    amounts = np.zeros(len(cells))
+    
+    missing = pd.isna(cells)
+    is_text = np.array([isinstance(v, str) for v in cells], dtype=bool)
+    is_number = np.array(
+        [isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_)) for v in cells],
+        dtype=bool
+    ) & ~missing
+    amounts[is_number] = cells[is_number].astype(np.float64)
+    parsed = is_number.copy()
+    
+    if is_text.any():
+        text = (
+            pd.Series(cells[is_text], dtype=object)
+            .str.replace(',', '', regex=False).str.replace('$', '', regex=False)
+            .str.replace('(', '-', regex=False).str.replace(')', '', regex=False)
+        )
+        # to_numeric only picks the cells; astype(float) matches float() exactly
+        converts = pd.to_numeric(text, errors='coerce').notna().to_numpy(dtype=bool)
+        text_values = np.zeros(len(text))
+        try:
+            text_values[converts] = text[converts].to_numpy(dtype=object).astype(np.float64)
+        except ValueError:
+            # to_numeric takes a few spellings float() rejects ("1e 5");
+            # leave the text to the scalar parser, which treats them as missing
+            converts = np.zeros(len(text), dtype=bool)
+        amounts[is_text] = text_values
+        parsed[is_text] = converts
+    
+    # Anything else (odd spellings, bools, dates) takes the scalar path
+    for k in np.flatnonzero(~missing & ~parsed):
+        amount = _parse_total_amount(cells[k])
+        if amount is not None:
+            amounts[k] = amount
+            parsed[k] = True
+    
+    return amounts, parsed
+
+
 def extract_gl_totals(gl_file: str, date_format: str = "auto") -> Dict[str, float]:
     """
     Extract 'Total for X' lines from GL file.
     These are QBO's stated totals that we should match.
     
-    Returns dict of {account_name: total_amount}
+    Returns dict of {account_name: total_amount}. Results are cached per file
+    path, modification time and size; each call gets its own copy.
     """
-    df = pd.read_excel(gl_file, sheet_name=0, header=None)
+    path = os.path.abspath(gl_file)
+    stat = os.stat(path)
+    return dict(_extract_gl_totals_cached(path, stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=8)
+def _extract_gl_totals_cached(gl_file: str, mtime_ns: int, size: int) -> Dict[str, float]:
+    # Shared cached reader (calamine when installed)
+    df = read_gl_sheet(gl_file, 0)
     
     gl_totals = {}
     
+    # Plain object array plus missing-cell mask: indexing these avoids
+    # building a Series per row
+    values = df.to_numpy(dtype=object)
+    missing = pd.isna(values)
+    n_rows, n_cols = values.shape
+    if n_cols == 0:
+        return gl_totals
+    
     # Find header row to know where data starts
     header_row = 0
-    for i, row in df.iterrows():
-        row_str = ' '.join([str(v).lower() for v in row.values if pd.notna(v)])
-        if 'date' in row_str and ('type' in row_str or 'transaction' in row_str or 'amount' in row_str):
+    for i in range(n_rows):
+        row_str = ' '.join([str(v) for v, m in zip(values[i], missing[i]) if not m])
+        if HEADER_DATE_RE.search(row_str) and HEADER_GL_RE.search(row_str):
             header_row = i
             break
     
-    # Find the balance/amount column (usually last numeric column in Total rows)
+    # "Total for X" rows, from one vectorized test on the first column
+    col0 = pd.Series(values[:, 0], dtype=object).astype(str).str.strip().where(~missing[:, 0], "")
+    total_rows = np.flatnonzero(col0.str.startswith(TOTAL_FOR_PREFIX).to_numpy(dtype=bool))
+    
+    # Find the balance/amount column: the last parseable cell of the first
+    # Total row that has one
     balance_col = None
-    for i, row in df.iterrows():
-        col0 = str(row[0]).strip() if pd.notna(row[0]) else ""
-        if col0.startswith("Total for "):
-            # Find the column with the total value
-            for col_idx in range(len(row) - 1, 0, -1):
-                if pd.notna(row[col_idx]):
-                    try:
-                        val = row[col_idx]
-                        if isinstance(val, str):
-                            val = val.replace(',', '').replace('$', '').replace('(', '-').replace(')', '')
-                        float(val)
-                        balance_col = col_idx
-                        break
-                    except:
-                        pass
-            if balance_col:
+    for i in total_rows:
+        for col_idx in range(n_cols - 1, 0, -1):
+            if not missing[i, col_idx] and _parse_total_amount(values[i, col_idx]) is not None:
+                balance_col = col_idx
                 break
+        if balance_col is not None:
+            break
     
-    # Extract all "Total for X" lines
-    for i, row in df.iterrows():
-        if i <= header_row:
-            continue
-            
-        col0 = str(row[0]).strip() if pd.notna(row[0]) else ""
+    # Extract all "Total for X" lines below the header, their amounts
+    # parsed together (0 when missing or unparseable)
+    rows = total_rows[total_rows > header_row]
+    if balance_col is not None:
+        amounts, parsed = _parse_total_amounts(values[rows, balance_col])
+    else:
+        amounts, parsed = np.zeros(len(rows)), np.zeros(len(rows), dtype=bool)
+    
+    for i, amount, ok in zip(rows, amounts.tolist(), parsed.tolist()):
+        # Extract account name (remove "Total for " and "with sub-accounts")
+        account_name = col0[i].replace(TOTAL_FOR_PREFIX, "").replace(" with sub-accounts", "").strip()
         
-        if col0.startswith("Total for "):
-            # Extract account name (remove "Total for " and "with sub-accounts")
-            account_name = col0.replace("Total for ", "").replace(" with sub-accounts", "").strip()
-            
-            # Get the total amount
-            amount = 0
-            if balance_col and pd.notna(row[balance_col]):
-                try:
-                    val = row[balance_col]
-                    if isinstance(val, str):
-                        val = val.replace(',', '').replace('$', '').replace('(', '-').replace(')', '')
-                    amount = float(val)
-                except:
-                    pass
-            
-            # Store the total (use the last one if there are multiple, as it's the final balance)
-            gl_totals[account_name] = amount
+        # Store the total (use the last one if there are multiple, as it's the final balance)
+        gl_totals[account_name] = amount if ok else 0
     
     return gl_totals
 
 
+# Filler words ignored when comparing account names word by word
+_NAME_FILLER = frozenset({'and', 'the', 'of', 'for', 'a', 'an', ''})
+
+
+def _normalize_name(s: str) -> str:
+    """Fold common wording variations out of a lowercased account name"""
+    s = s.replace(" and ", " & ").replace(" & ", " ")
+    s = s.replace("charges", "").replace("fees", "fee")
+    s = s.replace("expense", "").replace("expenses", "")
+    s = s.replace("professional", "prof").replace("legal", "legal")
+    # Remove common suffixes/prefixes
+    s = s.replace("  ", " ").strip()
+    return s
+
+
+def _name_key(name: str) -> Tuple[str, str, frozenset]:
+    """(lowercased, normalized, significant words) of an account name, for _keys_match"""
+    n = name.lower().strip()
+    words = frozenset(n.replace(":", " ").replace("&", " ").replace("-", " ").split()) - _NAME_FILLER
+    return n, _normalize_name(n), words
+
+
+def _keys_match(key1: Tuple[str, str, frozenset], key2: Tuple[str, str, frozenset]) -> bool:
+    """Check if two account names (as _name_key tuples) likely refer to the same account"""
+    n1, n1_norm, words1 = key1
+    n2, n2_norm, words2 = key2
+    
+    # Exact match, or one contains the other (handles parent:child paths)
+    if n1 in n2 or n2 in n1:
+        return True
+    
+    # Normalize common variations
+    if n1_norm == n2_norm:
+        return True
+    
+    # Check if significant words overlap (for "Bank Charges and Fees" vs "Bank Fees")
+    if words1 and words2:
+        # If one set is subset of the other, or significant overlap
+        overlap = words1 & words2
+        if overlap and (len(overlap) >= min(len(words1), len(words2)) * 0.6):
+            return True
+    
+    return False
+
+
 def validate_gl_parsing(
     gl_file: str,
     parsed_accounts: Dict,  # Dict[str, AccountSummary]
@@ -130,55 +246,37 @@ def validate_gl_parsing(
             summary="⚠️ Validation skipped - no 'Total for' lines found in GL"
         )
     
-    # Helper function for fuzzy account name matching
-    def names_match(name1: str, name2: str) -> bool:
-        """Check if two account names likely refer to the same account"""
-        n1 = name1.lower().strip()
-        n2 = name2.lower().strip()
-        
-        # Exact match
-        if n1 == n2:
-            return True
-        
-        # One contains the other (handles parent:child)
-        if n1 in n2 or n2 in n1:
-            return True
-        
-        # Match at end of parent:child path
-        if n1.endswith(":" + n2) or n2.endswith(":" + n1):
-            return True
-        
-        # Normalize common variations
-        def normalize(s):
-            s = s.replace(" and ", " & ").replace(" & ", " ")
-            s = s.replace("charges", "").replace("fees", "fee")
-            s = s.replace("expense", "").replace("expenses", "")
-            s = s.replace("professional", "prof").replace("legal", "legal")
-            # Remove common suffixes/prefixes
-            s = s.replace("  ", " ").strip()
-            return s
-        
-        n1_norm = normalize(n1)
-        n2_norm = normalize(n2)
-        
-        if n1_norm == n2_norm:
-            return True
-        
-        # Check if significant words overlap (for "Bank Charges and Fees" vs "Bank Fees")
-        words1 = set(n1.replace(":", " ").replace("&", " ").replace("-", " ").split())
-        words2 = set(n2.replace(":", " ").replace("&", " ").replace("-", " ").split())
-        # Remove common filler words
-        filler = {'and', 'the', 'of', 'for', 'a', 'an', ''}
-        words1 = words1 - filler
-        words2 = words2 - filler
-        
-        if words1 and words2:
-            # If one set is subset of the other, or significant overlap
-            overlap = words1 & words2
-            if overlap and (len(overlap) >= min(len(words1), len(words2)) * 0.6):
-                return True
-        
-        return False
+    # Lowercased/normalized form of every parsed name, computed once
+    # instead of per comparison
+    parsed_keys = [(name, summary, _name_key(name)) for name, summary in parsed_accounts.items()]
+    # ...and each account's total, aligned with parsed_keys
+    parsed_totals = [summary.total for summary in parsed_accounts.values()]
+    
+    # Parsed-account positions by every lowercased "parent:" prefix of their
+    # name, and by the first segment of names that have one (with its key)
+    children_by_prefix = {}
+    children_by_segment = {}
+    for position, (parsed_name, _, _) in enumerate(parsed_keys):
+        parts = parsed_name.lower().split(":")
+        for i in range(1, len(parts)):
+            children_by_prefix.setdefault(":".join(parts[:i]), []).append(position)
+        if ":" in parsed_name:
+            segment = parsed_name.split(":")[0]
+            if segment not in children_by_segment:
+                children_by_segment[segment] = (_name_key(segment), [])
+            children_by_segment[segment][1].append(position)
+    
+    # COA types by lowercased name and by every ":"-suffix of the lowercased
+    # name; the earliest COA entry wins, as a scan in mapping order would
+    coa_by_lower = {}
+    coa_by_suffix = {}
+    if skip_balance_sheet and account_map:
+        for position, (coa_name, coa_type) in enumerate(account_map.items()):
+            coa_lower = coa_name.lower()
+            coa_by_lower.setdefault(coa_lower, (position, coa_type))
+            parts = coa_lower.split(":")
+            for i in range(1, len(parts)):
+                coa_by_suffix.setdefault(":".join(parts[i:]), (position, coa_type))
     
     # Compare our totals to GL totals
     for account_name, expected_total in gl_totals.items():
@@ -187,14 +285,11 @@ def validate_gl_parsing(
             # Look up account type in COA mapping
             account_type = account_map.get(account_name)
             if not account_type:
-                # Try case-insensitive lookup
-                for coa_name, coa_type in account_map.items():
-                    if coa_name.lower() == account_name.lower():
-                        account_type = coa_type
-                        break
-                    if coa_name.lower().endswith(":" + account_name.lower()):
-                        account_type = coa_type
-                        break
+                # Try case-insensitive lookup (same name, or the end of a parent:child path)
+                account_lower = account_name.lower()
+                found = [m for m in (coa_by_lower.get(account_lower), coa_by_suffix.get(account_lower)) if m]
+                if found:
+                    account_type = min(found, key=lambda m: m[0])[1]
             
             if account_type in BALANCE_SHEET_TYPES:
                 skipped_bs_accounts.append(account_name)
@@ -204,14 +299,16 @@ def validate_gl_parsing(
         actual_total = None
         matched_account = None
         
+        account_key = _name_key(account_name)
+        
         # Try exact match first
         if account_name in parsed_accounts:
             actual_total = parsed_accounts[account_name].total
             matched_account = account_name
         else:
             # Try fuzzy matching
-            for parsed_name, summary in parsed_accounts.items():
-                if names_match(account_name, parsed_name):
+            for parsed_name, summary, parsed_key in parsed_keys:
+                if _keys_match(account_key, parsed_key):
                     actual_total = summary.total
                     matched_account = parsed_name
                     break
@@ -220,17 +317,15 @@ def validate_gl_parsing(
             # Account exists in GL totals but not in our parsed data
             # This could be a parent account with sub-accounts (we sum children instead)
             # Check if it's a parent by looking for children (fuzzy match)
-            children = [
-                (parsed_name, summary) for parsed_name, summary in parsed_accounts.items()
-                if (parsed_name.startswith(account_name + ":") or 
-                    parsed_name.lower().startswith(account_name.lower() + ":") or
-                    # Also check if parsed_name looks like a child via fuzzy match
-                    ((":" in parsed_name) and names_match(account_name, parsed_name.split(":")[0])))
-            ]
+            positions = set(children_by_prefix.get(account_name.lower(), ()))
+            for segment_key, segment_positions in children_by_segment.values():
+                if _keys_match(account_key, segment_key):
+                    positions.update(segment_positions)
+            children = sorted(positions)
             
             if children:
                 # Sum children to get parent total
-                child_total = sum(summary.total for _, summary in children)
+                child_total = sum([parsed_totals[position] for position in children])
                 actual_total = child_total
                 matched_account = f"{account_name} (summed from {len(children)} children)"
             else:
@@ -245,17 +340,15 @@ def validate_gl_parsing(
                 })
                 continue
         
-        # Calculate variance
+        # Calculate variance; within the absolute tolerance (the common
+        # case) there's no need for the percentage
         variance = actual_total - expected_total
-        pct_variance = abs(variance / expected_total * 100) if expected_total != 0 else (100 if variance != 0 else 0)
+        if abs(variance) <= tolerance_abs:
+            continue
         
-        # Check if within tolerance
-        within_tolerance = (
-            abs(variance) <= tolerance_abs or 
-            pct_variance <= tolerance_pct
-        )
+        pct_variance = abs(variance / expected_total * 100) if expected_total != 0 else (100 if variance != 0 else 0)
         
-        if not within_tolerance:
+        if not pct_variance <= tolerance_pct:
             discrepancies.append({
                 "account": account_name,
                 "matched_as": matched_account,
@@ -269,51 +362,57 @@ def validate_gl_parsing(
     # Check for accounts in COA with no transactions (potential missed accounts)
     missing_accounts = []
     if account_map:
+        # Lowercased parsed names and every ":"-suffix of them, as sets
+        parsed_lower = {parsed_name.lower() for parsed_name in parsed_accounts}
+        parsed_suffixes = set()
+        for name_lower in parsed_lower:
+            parts = name_lower.split(":")
+            parsed_suffixes.update(":".join(parts[i:]) for i in range(1, len(parts)))
+        
         for coa_account, coa_type in account_map.items():
             # Skip number-prefixed duplicates
-            if any(char.isdigit() for char in coa_account.split()[0] if coa_account.split()):
+            if _DIGIT_FIRST_WORD_RE.match(coa_account):
                 continue
             
             # Skip balance sheet accounts if configured
             if skip_balance_sheet and coa_type in BALANCE_SHEET_TYPES:
                 continue
             
-            found = False
-            for parsed_name in parsed_accounts.keys():
-                if (coa_account.lower() == parsed_name.lower() or
-                    parsed_name.lower().endswith(":" + coa_account.lower()) or
-                    coa_account.lower().endswith(":" + parsed_name.lower())):
-                    found = True
-                    break
+            # Same name, or either one is the end of the other's parent:child path
+            coa_lower = coa_account.lower()
+            coa_parts = coa_lower.split(":")
+            found = (
+                coa_lower in parsed_lower or
+                coa_lower in parsed_suffixes or
+                any(":".join(coa_parts[i:]) in parsed_lower for i in range(1, len(coa_parts)))
+            )
             
-            if not found and coa_account not in missing_accounts:
-                # Check if it might be a parent of something we do have
-                is_parent = any(
-                    parsed_name.lower().startswith(coa_account.lower() + ":")
-                    for parsed_name in parsed_accounts.keys()
-                )
-                if not is_parent:
-                    missing_accounts.append(coa_account)
+            # Also not missing if it's the parent of something we do have
+            if not found and coa_lower not in children_by_prefix:
+                missing_accounts.append(coa_account)
     
     # Build summary
     passed = len(discrepancies) == 0
     pnl_accounts_checked = len(gl_totals) - len(skipped_bs_accounts)
     
     if passed:
-        summary = f"✅ Validation PASSED - {pnl_accounts_checked} P&L account totals verified"
+        summary_lines = [f"✅ Validation PASSED - {pnl_accounts_checked} P&L account totals verified"]
         if skipped_bs_accounts:
-            summary += f"\n📋 Skipped {len(skipped_bs_accounts)} balance sheet accounts (Assets/Liabilities/Equity)"
+            summary_lines.append(f"📋 Skipped {len(skipped_bs_accounts)} balance sheet accounts (Assets/Liabilities/Equity)")
         if missing_accounts:
-            summary += f"\n⚠️ {len(missing_accounts)} COA accounts had no transactions (may be inactive)"
+            summary_lines.append(f"⚠️ {len(missing_accounts)} COA accounts had no transactions (may be inactive)")
     else:
-        summary = f"❌ Validation FAILED - {len(discrepancies)} discrepancies found"
+        summary_lines = [f"❌ Validation FAILED - {len(discrepancies)} discrepancies found"]
         if skipped_bs_accounts:
-            summary += f"\n📋 Skipped {len(skipped_bs_accounts)} balance sheet accounts"
-        summary += "\n\nDiscrepancies:"
-        for d in discrepancies[:10]:  # Show first 10
-            summary += f"\n  • {d['account']}: expected ${d['expected']:,.2f}, got ${d['actual']:,.2f} (${d['variance']:+,.2f})"
+            summary_lines.append(f"📋 Skipped {len(skipped_bs_accounts)} balance sheet accounts")
+        summary_lines += ["", "Discrepancies:"]
+        summary_lines.extend(  # Show first 10
+            f"  • {d['account']}: expected ${d['expected']:,.2f}, got ${d['actual']:,.2f} (${d['variance']:+,.2f})"
+            for d in discrepancies[:10]
+        )
         if len(discrepancies) > 10:
-            summary += f"\n  ... and {len(discrepancies) - 10} more"
+            summary_lines.append(f"  ... and {len(discrepancies) - 10} more")
+    summary = "\n".join(summary_lines)
     
     return ValidationResult(
         passed=passed,
@@ -340,11 +439,11 @@ def validate_pnl_totals(
     warnings = []
     
     # Calculate our totals
-    calc_revenue = sum(abs(v) for v in pnl.get("Revenue", {}).values())
-    calc_cogs = sum(abs(v) for v in pnl.get("Cost of Goods Sold", {}).values())
-    calc_expenses = sum(abs(v) for v in pnl.get("Expenses", {}).values())
-    calc_other_income = sum(abs(v) for v in pnl.get("Other Income", {}).values())
-    calc_other_expense = sum(abs(v) for v in pnl.get("Other Expense", {}).values())
+    calc_revenue = sum(map(abs, pnl.get("Revenue", {}).values()))
+    calc_cogs = sum(map(abs, pnl.get("Cost of Goods Sold", {}).values()))
+    calc_expenses = sum(map(abs, pnl.get("Expenses", {}).values()))
+    calc_other_income = sum(map(abs, pnl.get("Other Income", {}).values()))
+    calc_other_expense = sum(map(abs, pnl.get("Other Expense", {}).values()))
     calc_net = calc_revenue - calc_cogs - calc_expenses + calc_other_income - calc_other_expense
     
     # Check against expected values if provided
@@ -383,9 +482,10 @@ def validate_pnl_totals(
     if passed:
         summary = "✅ P&L totals validated successfully"
     else:
-        summary = f"❌ P&L validation found {len(discrepancies)} discrepancies:\n"
-        for d in discrepancies:
-            summary += f"  • {d['category']}: expected ${d['expected']:,.2f}, got ${d['actual']:,.2f}\n"
+        summary = "".join(
+            [f"❌ P&L validation found {len(discrepancies)} discrepancies:\n"] +
+            [f"  • {d['category']}: expected ${d['expected']:,.2f}, got ${d['actual']:,.2f}\n" for d in discrepancies]
+        )
     
     return ValidationResult(
         passed=passed,
@@ -445,7 +545,7 @@ def generate_validation_report(
     report_lines.append(f"\nP&L Categories:")
     for category, accounts in pnl.items():
         if accounts:
-            total = sum(abs(v) for v in accounts.values())
+            total = sum(map(abs, accounts.values()))
             report_lines.append(f"  • {category}: {len(accounts)} accounts, ${total:,.2f}")
     
     # Final verdict